@@ -1,22 +1,91 @@
 from __future__ import annotations
 
 import os
+import uuid
 
 import streamlit as st
 from dotenv import load_dotenv
 
+from src.adaptive.engine import AdaptiveEngine
+from src.common.health import AppStatus, start_health_server
+from src.config.registry import config_registry
+from src.config.settings import settings
 from src.generator.question_generator import QuestionGenerator
+from src.generator.quiz_planner import FILL_BLANK, MCQ, QuizSpec
+from src.llm.circuit_breaker import health_report
+from src.llm.usage import usage_tracker
+from src.topics.canonicalizer import TopicIndex
 from src.utils.helpers import QuizManager
 
 
+@st.cache_resource
+def _start_config_watcher() -> bool:
+    """
+    Watch CONFIG_FILE once per process so settings/prompts reload without a restart.
+    """
+    config_registry.start_watcher()
+    return True
+
+
+@st.cache_resource
+def _app_status() -> AppStatus:
+    """
+    Process-wide status shared with the health server thread.
+    """
+    return AppStatus()
+
+
+@st.cache_resource
+def _start_health_server() -> bool:
+    """
+    Serve the health endpoints and /metrics on HEALTH_PORT once per process (0 disables).
+    """
+    if settings.health_port:
+        start_health_server(settings.health_port, health_report, _app_status())
+    return True
+
+
+@st.cache_resource
+def _get_topic_index() -> TopicIndex:
+    """
+    One topic index per process so "python" / "Python basics" converge on one key.
+    """
+    return TopicIndex()
+
+
+@st.cache_resource
+def _get_adaptive_engine() -> AdaptiveEngine:
+    """
+    One engine per process, shared by all sessions (ratings + question bank).
+    """
+    status = _app_status()
+    try:
+        engine = AdaptiveEngine(topic_normalizer=_get_topic_index().canonicalize)
+        for path in settings.question_bank_paths:
+            engine.load_jsonl(path)
+    except Exception as e:
+        # Not cached: the next session retries; until then /healthz is not ready.
+        status.init_error = f"question bank: {e}"
+        raise
+    status.init_error = None
+    status.bank_size = engine.__len__
+    return engine
+
+
 def _init_session_state() -> None:
     """
     Streamlit reruns the script on every interaction.
 
     Initialize session state keys once so the app flow is stable.
     """
+    if "user_id" not in st.session_state:
+        st.session_state["user_id"] = uuid.uuid4().hex
+
     if "quiz_manager" not in st.session_state:
-        st.session_state["quiz_manager"] = QuizManager()
+        st.session_state["quiz_manager"] = QuizManager(
+            engine=_get_adaptive_engine(),
+            user_id=st.session_state["user_id"],
+        )
 
     if "quiz_generated" not in st.session_state:
         st.session_state["quiz_generated"] = False
@@ -38,22 +107,28 @@ def _reset_quiz() -> None:
     st.session_state["saved_results_file"] = None
 
 
-def _build_sidebar() -> tuple[str, str, str, int]:
+def _build_sidebar() -> tuple[str, str, str, int, int]:
     st.sidebar.header("⚙️ Quiz settings")
 
     question_type = st.sidebar.selectbox(
         "❓ Question type",
-        ["Multiple Choice Question", "Fill in the Blank"],
+        ["Multiple Choice Question", "Fill in the Blank", "Mixed"],
         index=0,
     )
 
     topic = st.sidebar.text_input(
-        "📚 Topic",
+        "📚 Topic(s)",
         value=st.session_state.get("topic", ""),
         placeholder="Indian history, Python programming, etc.",
+        help="Separate several subtopics with commas to spread the quiz across them.",
     )
 
-    difficulty = st.sidebar.selectbox("🎯 Difficulty", ["Easy", "Medium", "Hard"], index=1)
+    difficulty = st.sidebar.selectbox(
+        "🎯 Difficulty",
+        ["Adaptive", "Easy", "Medium", "Hard"],
+        index=0,
+        help="Adaptive picks questions that match your level on this topic.",
+    )
 
     num_questions = st.sidebar.slider(
         "🔢 Number of questions",
@@ -63,18 +138,55 @@ def _build_sidebar() -> tuple[str, str, str, int]:
         step=1,
     )
 
+    mcq_count = num_questions
+    if question_type == "Mixed":
+        mcq_count = st.sidebar.slider(
+            "🔀 Multiple choice questions in the mix",
+            min_value=0,
+            max_value=num_questions,
+            value=(num_questions + 1) // 2,
+            step=1,
+        )
+
+    used = usage_tracker.session_usage(st.session_state["user_id"]).total_tokens
+    budget = config_registry.current().settings.session_token_budget
+    if budget:
+        st.sidebar.caption(f"🪙 Tokens used: {used:,} / {budget:,}")
+    else:
+        st.sidebar.caption(f"🪙 Tokens used: {used:,}")
+
     st.session_state["topic"] = topic
-    return question_type, topic, difficulty, num_questions
+    return question_type, topic, difficulty, num_questions, mcq_count
+
+
+def _split_topics(topic: str) -> list[str]:
+    return [t.strip() for t in topic.split(",") if t.strip()]
+
+
+def _build_quiz_spec(
+    question_type: str,
+    topics: list[str],
+    difficulty: str,
+    num_questions: int,
+    mcq_count: int,
+) -> QuizSpec:
+    if question_type == "Mixed":
+        type_counts = {MCQ: mcq_count, FILL_BLANK: num_questions - mcq_count}
+    else:
+        type_counts = {question_type: num_questions}
+    return QuizSpec.mix(topics, type_counts, difficulty)
 
 
 def main() -> None:
     st.set_page_config(page_title="Study Buddy AI", page_icon="📚", layout="wide")
     load_dotenv()
+    _start_config_watcher()
+    _start_health_server()
     _init_session_state()
 
     st.title("📚 Study Buddy AI")
 
-    question_type, topic, difficulty, num_questions = _build_sidebar()
+    question_type, topic, difficulty, num_questions, mcq_count = _build_sidebar()
     qm: QuizManager = st.session_state["quiz_manager"]
 
     col1, col2 = st.columns([1, 1])
@@ -88,7 +200,9 @@ def main() -> None:
         st.rerun()
 
     if generate_clicked:
-        if not topic.strip():
+        # "," or ", ," pass a plain strip() check but contain no topic.
+        topics = _split_topics(topic)
+        if not topics:
             st.warning("⚠️ Please enter a topic before generating the quiz.")
             st.stop()
 
@@ -97,18 +211,15 @@ def main() -> None:
 
         # Creating the generator can fail if env vars are missing.
         try:
-            generator = QuestionGenerator()
+            generator = QuestionGenerator(session_id=st.session_state["user_id"])
         except Exception as e:
             st.error(f"❌ {e}")
             st.stop()
 
         with st.spinner("⏳ Generating questions..."):
-            success = qm.generate_questions(
+            success = qm.generate_quiz(
                 generator=generator,
-                topic=topic,
-                question_type=question_type,
-                difficulty=difficulty,
-                num_questions=num_questions,
+                spec=_build_quiz_spec(question_type, topics, difficulty, num_questions, mcq_count),
             )
 
         st.session_state["quiz_generated"] = bool(success)
@@ -34,4 +34,9 @@ setup(
     python_requires=">=3.12",
     packages=find_packages(),
     install_requires=read_requirements("requirements.in"),
+    entry_points={
+        "console_scripts": [
+            "study-buddy-bulk=src.cli.bulk_generate:main",
+        ],
+    },
 )
\ No newline at end of file
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Elo scale anchors for the UI difficulty labels.
+DIFFICULTY_RATINGS = {"easy": 1300.0, "medium": 1500.0, "hard": 1700.0}
+DEFAULT_RATING = DIFFICULTY_RATINGS["medium"]
+
+
+def topic_key(topic: str) -> str:
+    """
+    Normalize a free-text topic into an index key.
+    """
+    return " ".join(topic.lower().split())
+
+
+def item_id_for(question: dict[str, Any]) -> str:
+    """
+    Stable id for a question dict (as stored by QuizManager / the bulk CLI).
+    """
+    raw = f"{question['type']}\x1f{' '.join(str(question['question']).lower().split())}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def expected_score(learner_rating: float, item_rating: float) -> float:
+    """
+    Elo/1PL-IRT probability that the learner answers the item correctly.
+    """
+    return 1.0 / (1.0 + math.pow(10.0, (item_rating - learner_rating) / 400.0))
+
+
+@dataclass
+class ItemStats:
+    item_id: str
+    topic: str
+    question: dict[str, Any]
+    rating: float
+    attempts: int = 0
+    correct: int = 0
+
+
+@dataclass
+class LearnerStats:
+    rating: float = DEFAULT_RATING
+    attempts: int = 0
+    correct: int = 0
+    seen: set[str] = field(default_factory=set)
+
+
+class AdaptiveEngine:
+    """
+    Incrementally updated item/learner ratings plus a bucketed question bank.
+
+    - Each answer updates one learner and one item rating in O(1) (Elo with a
+      K-factor that shrinks as evidence accumulates).
+    - Items are indexed by (topic, question type, rating bucket), so selecting
+      questions near a target rating only touches a few neighbouring buckets.
+
+    One instance is shared by all Streamlit sessions in the process, hence the lock.
+    """
+
+    def __init__(
+        self,
+        *,
+        k_learner: float = 32.0,
+        k_item: float = 16.0,
+        bucket_width: float = 50.0,
+        max_rating_distance: float = 300.0,
+        topic_normalizer: Callable[[str], str] = topic_key,
+    ):
+        # Swap in `TopicIndex.canonicalize` so topic variants share ratings and items.
+        self.topic_key = topic_normalizer
+        self.k_learner = k_learner
+        self.k_item = k_item
+        self.bucket_width = bucket_width
+        self.max_rating_distance = max_rating_distance
+
+        self._lock = threading.RLock()
+        self._items: dict[str, ItemStats] = {}
+        self._index: dict[tuple[str, str], dict[int, set[str]]] = {}
+        self._learners: dict[tuple[str, str], LearnerStats] = {}
+
+    # --- Bank ---------------------------------------------------------------
+
+    def _bucket(self, rating: float) -> int:
+        return int(rating // self.bucket_width)
+
+    def _buckets_for(self, topic: str, qtype: str) -> dict[int, set[str]]:
+        return self._index.setdefault((topic, qtype), {})
+
+    def add_item(self, topic: str, question: dict[str, Any], difficulty: str = "medium") -> str:
+        """
+        Add a generated question to the bank (idempotent); returns its item id.
+        """
+        item_id = question.get("item_id") or item_id_for(question)
+        key = self.topic_key(topic)
+        with self._lock:
+            if item_id in self._items:
+                return item_id
+
+            rating = DIFFICULTY_RATINGS.get(difficulty.lower(), DEFAULT_RATING)
+            stored = {k: v for k, v in question.items() if k != "item_id"}
+            self._items[item_id] = ItemStats(item_id, key, stored, rating)
+            self._buckets_for(key, question["type"]).setdefault(self._bucket(rating), set()).add(item_id)
+        return item_id
+
+    def load_jsonl(self, path: str | Path) -> int:
+        """
+        Load a question bank written by the bulk CLI; returns the number of new items.
+
+        Malformed lines (e.g. the partial tail of a killed bulk run) are skipped
+        and counted, so one bad record never prevents the app from starting.
+        """
+        path = Path(path)
+        if not path.exists():
+            logger.warning(f"Question bank not found: {path}")
+            return 0
+
+        before = len(self)
+        skipped = 0
+        with path.open(encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    rec = json.loads(line)
+                    question = {
+                        "type": rec["type"],
+                        "question": rec["question"],
+                        "correct_answer": rec["correct_answer"],
+                    }
+                    topic = rec["topic"]
+                except (ValueError, KeyError, TypeError):
+                    skipped += 1
+                    continue
+                if rec.get("options"):
+                    question["options"] = rec["options"]
+                self.add_item(topic, question, rec.get("difficulty", "medium"))
+
+        added = len(self) - before
+        if skipped:
+            logger.warning(f"Skipped {skipped} malformed line(s) in {path}")
+        logger.info(f"Loaded {added} questions from {path}")
+        return added
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def item_rating(self, item_id: str) -> float | None:
+        item = self._items.get(item_id)
+        return item.rating if item else None
+
+    # --- Learners -----------------------------------------------------------
+
+    def _learner(self, user_id: str, topic: str) -> LearnerStats:
+        return self._learners.setdefault((user_id, self.topic_key(topic)), LearnerStats())
+
+    def learner_rating(self, user_id: str, topic: str) -> float:
+        with self._lock:
+            stats = self._learners.get((user_id, self.topic_key(topic)))
+            return stats.rating if stats else DEFAULT_RATING
+
+    def mark_seen(self, user_id: str, topic: str, item_ids: Iterable[str]) -> None:
+        """
+        Record that items were served to the learner, so regenerating a quiz
+        before submitting it does not hand back the same questions.
+        """
+        with self._lock:
+            self._learner(user_id, topic).seen.update(item_ids)
+
+    @staticmethod
+    def difficulty_label(rating: float) -> str:
+        """
+        Nearest UI difficulty label for a rating (used as the prompt word).
+        """
+        return min(DIFFICULTY_RATINGS, key=lambda d: abs(DIFFICULTY_RATINGS[d] - rating))
+
+    def _k(self, base: float, attempts: int) -> float:
+        # Large steps while a rating is uncertain, settling to base/4.
+        return max(base / 4.0, base / (1.0 + attempts / 10.0))
+
+    def record_answer(self, user_id: str, topic: str, item_id: str, is_correct: bool) -> None:
+        """
+        O(1) Elo update of the learner and the item from a single answer.
+        """
+        with self._lock:
+            learner = self._learner(user_id, topic)
+            learner.seen.add(item_id)
+
+            item = self._items.get(item_id)
+            if item is None:
+                return
+
+            score = 1.0 if is_correct else 0.0
+            surprise = score - expected_score(learner.rating, item.rating)
+
+            learner.rating += self._k(self.k_learner, learner.attempts) * surprise
+            learner.attempts += 1
+            learner.correct += int(is_correct)
+
+            old_bucket = self._bucket(item.rating)
+            item.rating -= self._k(self.k_item, item.attempts) * surprise
+            item.attempts += 1
+            item.correct += int(is_correct)
+
+            new_bucket = self._bucket(item.rating)
+            if new_bucket != old_bucket:
+                buckets = self._buckets_for(item.topic, item.question["type"])
+                buckets[old_bucket].discard(item_id)
+                buckets.setdefault(new_bucket, set()).add(item_id)
+
+    # --- Selection ----------------------------------------------------------
+
+    def select(
+        self,
+        user_id: str,
+        topic: str,
+        question_type: str,
+        n: int,
+        target_rating: float | None = None,
+        exclude: Iterable[str] = (),
+        relaxed: bool = False,
+    ) -> list[dict[str, Any]]:
+        """
+        Pick up to `n` unseen bank questions closest to the target rating.
+
+        Defaults to the learner's current rating. Returned dicts carry `item_id`.
+        `relaxed=True` (used when the LLM is unavailable) drops the rating
+        distance limit and allows questions the learner has already seen.
+        """
+        if n <= 0:
+            return []
+
+        with self._lock:
+            key = self.topic_key(topic)
+            buckets = self._index.get((key, question_type))
+            if not buckets:
+                return []
+
+            learner = self._learners.get((user_id, key))
+            if target_rating is not None:
+                target = target_rating
+            else:
+                target = learner.rating if learner else DEFAULT_RATING
+            skip = set(exclude)
+            if learner and not relaxed:
+                skip |= learner.seen
+
+            center = self._bucket(target)
+            # Never scan past the outermost populated bucket.
+            max_offset = max(abs(b - center) for b in buckets)
+            if not relaxed:
+                max_offset = min(max_offset, int(self.max_rating_distance // self.bucket_width))
+
+            picked: list[dict[str, Any]] = []
+            for offset in range(max_offset + 1):
+                for b in {center - offset, center + offset}:
+                    candidates = sorted(
+                        (i for i in buckets.get(b, ()) if i not in skip),
+                        key=lambda i: abs(self._items[i].rating - target),
+                    )
+                    for item_id in candidates:
+                        picked.append({**self._items[item_id].question, "item_id": item_id})
+                        if len(picked) == n:
+                            return picked
+            return picked
@@ -0,0 +1,442 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.config.registry import config_registry
+from src.generator.question_generator import QuestionGenerator
+from src.llm.circuit_breaker import CircuitOpenError
+from src.llm.usage import TokenUsage, usage_tracker
+from src.validation.question_checks import reject_rates
+
+logger = get_logger(__name__)
+
+QUESTION_TYPES = {
+    "mcq": "Multiple Choice Question",
+    "fill_blank": "Fill in the Blank",
+}
+DIFFICULTIES = ("easy", "medium", "hard")
+# Upper bound on worker threads; the live in-flight window is `concurrency`.
+MAX_WORKERS = 64
+# Shortest pause after hitting an open circuit (half-open rejections carry no hint).
+MIN_CIRCUIT_PAUSE_S = 1.0
+# Give up after the provider has been unavailable this long without a single
+# success (revoked key, dead endpoint); the rest is left for a resume.
+DEFAULT_MAX_OUTAGE_S = 600.0
+
+
+@dataclass(frozen=True)
+class Job:
+    topic: str
+    difficulty: str
+    question_type: str  # key of QUESTION_TYPES
+    index: int
+
+    @property
+    def job_id(self) -> str:
+        return f"{self.topic}|{self.difficulty}|{self.question_type}|{self.index}"
+
+
+@dataclass
+class RunStats:
+    generated: int = 0
+    skipped: int = 0
+    failed: int = 0
+    aborted: bool = False
+    started_at: float = field(default_factory=time.perf_counter)
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+
+def _as_list(v: object, default: Iterable[str]) -> list[str]:
+    if v is None:
+        return list(default)
+    if isinstance(v, str):
+        return [v]
+    return [str(x) for x in v]  # type: ignore[union-attr]
+
+
+def load_manifest(
+    path: Path,
+    *,
+    difficulties: list[str],
+    question_types: list[str],
+    per_combo: int,
+) -> list[Job]:
+    """
+    Expand a topic manifest into generation jobs.
+
+    Supported formats:
+    - `.txt`: one topic per line (blank lines and `#` comments ignored)
+    - `.json`: a list of topic strings, or a list of objects such as
+      `{"topic": "...", "difficulties": [...], "question_types": [...], "count": 5}`
+      where every key except `topic` falls back to the CLI defaults.
+    """
+    if path.suffix.lower() == ".json":
+        raw = json.loads(path.read_text(encoding="utf-8"))
+        entries = raw.get("topics", []) if isinstance(raw, dict) else raw
+    else:
+        entries = [
+            line.strip()
+            for line in path.read_text(encoding="utf-8").splitlines()
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+    jobs: list[Job] = []
+    for entry in entries:
+        spec: dict[str, Any] = {"topic": entry} if isinstance(entry, str) else dict(entry)
+        topic = str(spec.get("topic", "")).strip()
+        if not topic:
+            raise ValueError(f"Manifest entry without a topic: {entry!r}")
+
+        entry_types = _as_list(spec.get("question_types"), question_types)
+        unknown = set(entry_types) - set(QUESTION_TYPES)
+        if unknown:
+            raise ValueError(f"Unknown question type(s) for '{topic}': {sorted(unknown)}")
+
+        count = int(spec.get("count", per_combo))
+        for difficulty in _as_list(spec.get("difficulties"), difficulties):
+            for qtype in entry_types:
+                for i in range(count):
+                    jobs.append(Job(topic, difficulty.lower(), qtype, i))
+
+    return jobs
+
+
+def load_completed(out_path: Path) -> set[str]:
+    """
+    Return job ids already present in the output file.
+
+    The JSONL output doubles as the checkpoint: a record is only written once the
+    question has been generated and validated. A partially written trailing line
+    (e.g. after a hard kill) is truncated so appends stay well-formed. Corrupt
+    complete lines elsewhere are moved to `<output>.rejects` and the records
+    after them are kept.
+    """
+    if not out_path.exists():
+        return set()
+
+    done: set[str] = set()
+    kept: list[bytes] = []
+    rejects: list[bytes] = []
+    with out_path.open("rb") as f:
+        for raw in f:
+            if not raw.endswith(b"\n"):
+                logger.warning(f"Truncating incomplete checkpoint tail in {out_path}")
+                break
+            try:
+                job_id = json.loads(raw)["job_id"]
+            except (ValueError, KeyError, TypeError):
+                rejects.append(raw)
+                continue
+            done.add(job_id)
+            kept.append(raw)
+
+    good = b"".join(kept)
+    if len(good) != out_path.stat().st_size:
+        if rejects:
+            rejects_path = out_path.with_name(out_path.name + ".rejects")
+            logger.warning(f"Moving {len(rejects)} corrupt line(s) from {out_path} to {rejects_path}")
+            with rejects_path.open("ab") as f:
+                f.writelines(rejects)
+        # Write the cleaned checkpoint next to it and swap atomically.
+        tmp_path = out_path.with_name(out_path.name + ".tmp")
+        tmp_path.write_bytes(good)
+        os.replace(tmp_path, out_path)
+
+    return done
+
+
+class JsonlWriter:
+    """
+    Append-only, thread-safe JSONL writer that flushes every record.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = path.open("a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def write(self, record: dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            self._f.write(line)
+            self._f.flush()
+            os.fsync(self._f.fileno())
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def generate_record(job: Job) -> dict[str, Any]:
+    # A generator per job picks up the current config version (hot reloads).
+    generator = QuestionGenerator(session_id=SESSION_ID)
+    record: dict[str, Any] = {
+        "job_id": job.job_id,
+        "topic": job.topic,
+        "difficulty": job.difficulty,
+        "type": QUESTION_TYPES[job.question_type],
+    }
+
+    if job.question_type == "mcq":
+        q = generator.generate_mcq(job.topic, job.difficulty)
+        record.update(question=q.question, options=q.options, correct_answer=q.correct_answer)
+    else:
+        q = generator.generate_fill_blank(job.topic, job.difficulty)
+        record.update(question=q.question, options=[], correct_answer=q.answer)
+
+    record["generated_at"] = datetime.now(timezone.utc).isoformat()
+    return record
+
+
+SESSION_ID = "bulk"
+
+
+def _circuit_open_cause(exc: BaseException | None) -> CircuitOpenError | None:
+    # Walk the cause chain: callers may have wrapped it in CustomException.
+    while exc is not None:
+        if isinstance(exc, CircuitOpenError):
+            return exc
+        exc = exc.__cause__
+    return None
+
+
+def _report(
+    stats: RunStats,
+    usage: TokenUsage,
+    input_cost_per_1m: float,
+    output_cost_per_1m: float,
+) -> str:
+    input_tokens, output_tokens = usage.input_tokens, usage.output_tokens
+    elapsed = stats.elapsed
+    qps = stats.generated / elapsed if elapsed > 0 else 0.0
+
+    lines = [
+        f"Generated: {stats.generated} | Skipped (checkpoint): {stats.skipped} | Failed: {stats.failed}",
+        f"Elapsed: {elapsed:.1f}s | Throughput: {qps:.2f} questions/s ({qps * 60:.1f}/min)",
+        f"Tokens: {input_tokens} in / {output_tokens} out",
+    ]
+    if stats.aborted:
+        lines.insert(0, "ABORTED: LLM provider unavailable; re-run to resume the remaining jobs")
+    if stats.generated:
+        per_1k = 1000 / stats.generated
+        cost = (
+            input_tokens * input_cost_per_1m + output_tokens * output_cost_per_1m
+        ) / 1_000_000
+        lines.append(
+            f"Per 1k questions: {(input_tokens + output_tokens) * per_1k:,.0f} tokens, "
+            f"${cost * per_1k:.4f}"
+        )
+    for attempt, attempt_usage in sorted(usage_tracker.attempt_usage().items()):
+        lines.append(f"Attempt {attempt}: {attempt_usage.total_tokens} tokens")
+    for check, (evaluated, rejected, rate) in sorted(reject_rates().items()):
+        lines.append(f"Check {check}: {rejected}/{evaluated} rejected ({rate:.1%})")
+    return "\n".join(lines)
+
+
+def run(
+    jobs: list[Job],
+    out_path: Path,
+    *,
+    concurrency: int | None = None,
+    input_cost_per_1m: float = 0.0,
+    output_cost_per_1m: float = 0.0,
+    progress_every: int = 25,
+    max_outage_s: float = DEFAULT_MAX_OUTAGE_S,
+) -> RunStats:
+    """
+    Generate every job not yet in `out_path`, streaming results as they complete.
+
+    With `concurrency=None` the in-flight window follows MAX_CONCURRENCY from
+    the config registry, so it can be tuned live through CONFIG_FILE.
+
+    Jobs rejected by an open circuit breaker are not failures: submission
+    pauses until the circuit may close again and the jobs are requeued, so a
+    short provider outage does not wipe out the rest of the manifest. If the
+    circuit keeps opening for `max_outage_s` without any job succeeding, the
+    run is aborted (`stats.aborted`) and the remaining jobs are left for a resume.
+    """
+    stats = RunStats()
+    done = load_completed(out_path)
+    pending = [job for job in jobs if job.job_id not in done]
+    stats.skipped = len(jobs) - len(pending)
+    logger.info(
+        f"{len(jobs)} jobs in manifest, {stats.skipped} already done, "
+        f"{len(pending)} to generate with concurrency={concurrency or 'MAX_CONCURRENCY'}"
+    )
+
+    writer = JsonlWriter(out_path)
+
+    executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="bulkgen")
+    # Keep a bounded window of in-flight futures instead of submitting the whole
+    # backlog up front, so an interrupt loses at most `concurrency` jobs.
+    queue = iter(pending)
+    requeued: deque[Job] = deque()
+    in_flight: dict[Future, Job] = {}
+    paused_until = 0.0
+    outage_started: float | None = None
+
+    def _window() -> int:
+        live = concurrency or config_registry.current().settings.max_concurrency
+        return max(1, min(live, MAX_WORKERS))
+
+    def _fill() -> None:
+        if time.monotonic() < paused_until:
+            return
+        while len(in_flight) < _window():
+            job = requeued.popleft() if requeued else next(queue, None)
+            if job is None:
+                return
+            in_flight[executor.submit(generate_record, job)] = job
+
+    try:
+        _fill()
+        while (in_flight or requeued) and not stats.aborted:
+            if not in_flight:
+                delay = paused_until - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                _fill()
+                continue
+
+            finished, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                job = in_flight.pop(fut)
+                try:
+                    writer.write(fut.result())
+                    stats.generated += 1
+                    outage_started = None
+                except Exception as e:
+                    circuit_open = _circuit_open_cause(e)
+                    if circuit_open is not None:
+                        now = time.monotonic()
+                        if outage_started is None:
+                            outage_started = now
+                        elif now - outage_started >= max_outage_s:
+                            stats.aborted = True
+                            logger.error(
+                                f"{circuit_open}; no successful job for {now - outage_started:.0f}s, "
+                                "aborting. Re-run to resume the remaining jobs."
+                            )
+                            break
+                        requeued.append(job)
+                        pause = max(circuit_open.retry_after, MIN_CIRCUIT_PAUSE_S)
+                        if time.monotonic() >= paused_until:
+                            logger.warning(f"{circuit_open}; pausing submissions for {pause:.0f}s")
+                        paused_until = max(paused_until, time.monotonic() + pause)
+                        continue
+                    stats.failed += 1
+                    logger.error(f"Job {job.job_id} failed: {e}")
+
+                if (stats.generated + stats.failed) % progress_every == 0:
+                    logger.info(
+                        f"Progress: {stats.generated + stats.failed}/{len(pending)} "
+                        f"({stats.generated / max(stats.elapsed, 1e-9):.2f} questions/s)"
+                    )
+            if not stats.aborted:
+                _fill()
+    except KeyboardInterrupt:
+        logger.warning("Interrupted; completed questions are checkpointed. Re-run to resume.")
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        writer.close()
+        usage = usage_tracker.session_usage(SESSION_ID)
+        report = _report(stats, usage, input_cost_per_1m, output_cost_per_1m)
+        logger.info("\n" + report)
+        # The report is the CLI's output; the app logger only writes to the
+        # log file, so always show it on the terminal too.
+        print(report, file=sys.stderr)
+
+    return stats
+
+
+def export_parquet(jsonl_path: Path, parquet_path: Path) -> None:
+    # pandas + pyarrow are already part of the app image.
+    import pandas as pd
+
+    df = pd.read_json(jsonl_path, lines=True)
+    parquet_path.parent.mkdir(parents=True, exist_ok=True)
+    df.to_parquet(parquet_path, index=False)
+    logger.info(f"Wrote {len(df)} questions to {parquet_path}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(
+        prog="study-buddy-bulk",
+        description="Pre-generate question banks offline from a topic manifest.",
+    )
+    p.add_argument("manifest", type=Path, help="Topic manifest (.txt or .json)")
+    p.add_argument(
+        "-o", "--output", type=Path, default=Path("question_bank.jsonl"),
+        help="JSONL output; also used as the resume checkpoint",
+    )
+    p.add_argument("--parquet", type=Path, default=None, help="Also export the bank to Parquet")
+    p.add_argument(
+        "--difficulties", nargs="+", default=list(DIFFICULTIES), choices=DIFFICULTIES,
+    )
+    p.add_argument(
+        "--question-types", nargs="+", default=list(QUESTION_TYPES), choices=list(QUESTION_TYPES),
+    )
+    p.add_argument(
+        "--per-combo", type=int, default=1,
+        help="Questions per topic x difficulty x type (manifest `count` overrides)",
+    )
+    p.add_argument(
+        "--concurrency", type=int, default=None,
+        help="Parallel workers (default: MAX_CONCURRENCY, live-reloadable)",
+    )
+    p.add_argument("--input-cost-per-1m", type=float, default=0.0, help="USD per 1M input tokens")
+    p.add_argument("--output-cost-per-1m", type=float, default=0.0, help="USD per 1M output tokens")
+    p.add_argument(
+        "--max-outage-seconds", type=float, default=DEFAULT_MAX_OUTAGE_S,
+        help="Abort (exit 2) after the provider is unavailable this long with no successful job",
+    )
+    return p
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    try:
+        jobs = load_manifest(
+            args.manifest,
+            difficulties=args.difficulties,
+            question_types=args.question_types,
+            per_combo=args.per_combo,
+        )
+        stats = run(
+            jobs,
+            args.output,
+            concurrency=args.concurrency,
+            input_cost_per_1m=args.input_cost_per_1m,
+            output_cost_per_1m=args.output_cost_per_1m,
+            max_outage_s=args.max_outage_seconds,
+        )
+        if args.parquet:
+            export_parquet(args.output, args.parquet)
+    except KeyboardInterrupt:
+        return 130
+    except Exception as e:
+        logger.error(str(CustomException("Bulk generation failed", e)))
+        return 1
+
+    return 0 if stats.failed == 0 and not stats.aborted else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+
+logger = get_logger(__name__)
+
+LLMCheck = Callable[[], tuple[bool, dict[str, str]]]
+
+
+def _no_bank() -> int:
+    return 0
+
+
+@dataclass
+class AppStatus:
+    """
+    What /healthz checks; written by the Streamlit script, read by the health thread.
+
+    - `init_error`: set while a process-wide resource (e.g. the question bank)
+      failed to initialize, so no session can start
+    - `bank_size`: number of questions that can be served without the LLM
+    """
+
+    init_error: str | None = None
+    bank_size: Callable[[], int] = _no_bank
+
+    def readiness(self, llm_check: LLMCheck) -> tuple[bool, dict[str, Any]]:
+        """
+        Not ready if initialization failed, or if the LLM circuit is open and
+        there is no question bank to fall back to. An LLM outage alone keeps
+        the pod ready: quizzes are served from the bank.
+        """
+        llm_available, backends = llm_check()
+        body: dict[str, Any] = {"llm": backends, "question_bank": self.bank_size()}
+        if self.init_error is not None:
+            return False, {"status": "error", "reason": self.init_error, **body}
+        if not llm_available and body["question_bank"] == 0:
+            reason = "LLM circuit open and question bank empty"
+            return False, {"status": "unavailable", "reason": reason, **body}
+        return True, {"status": "ok" if llm_available else "degraded", **body}
+
+
+def _make_handler(llm_check: LLMCheck, status: AppStatus) -> type[BaseHTTPRequestHandler]:
+    class HealthHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: str, content_type: str) -> None:
+            payload = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            path = self.path.split("?", 1)[0]
+            if path == "/livez":
+                self._send(200, "ok\n", "text/plain")
+            elif path == "/healthz":
+                ready, body = status.readiness(llm_check)
+                self._send(200 if ready else 503, json.dumps(body) + "\n", "application/json")
+            elif path == "/healthz/llm":
+                available, backends = llm_check()
+                body = json.dumps({"status": "ok" if available else "degraded", "llm": backends})
+                self._send(200 if available else 503, body + "\n", "application/json")
+            elif path == "/metrics":
+                self._send(200, metrics.render_prometheus(), "text/plain; version=0.0.4")
+            else:
+                self._send(404, "not found\n", "text/plain")
+
+        def log_message(self, format: str, *args: object) -> None:
+            # Probes hit these endpoints every few seconds; keep them out of the app log.
+            pass
+
+    return HealthHandler
+
+
+def start_health_server(
+    port: int,
+    llm_check: LLMCheck,
+    status: AppStatus | None = None,
+) -> ThreadingHTTPServer | None:
+    """
+    Serve /livez, /healthz, /healthz/llm and /metrics from a daemon thread next to Streamlit.
+
+    - /livez: the process is up (always 200)
+    - /healthz: readiness, see `AppStatus.readiness` (503 only if the app
+      cannot serve any quiz)
+    - /healthz/llm: 503 while any LLM circuit is open (alerting, not a probe)
+    - /metrics: Prometheus text format of the shared metrics registry
+
+    Returns None (and logs) if the port cannot be bound, e.g. already in use
+    in local dev: health endpoints are optional, the app must still start.
+    """
+    try:
+        server = ThreadingHTTPServer(("0.0.0.0", port), _make_handler(llm_check, status or AppStatus()))
+    except OSError as e:
+        logger.error(f"Health endpoints disabled: cannot listen on :{port} ({e})")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="health-server", daemon=True).start()
+    logger.info(f"Health endpoints listening on :{port}")
+    return server
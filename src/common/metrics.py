@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from collections import defaultdict
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+def _label_key(labels: dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Minimal in-process metrics store (counters + gauges), safe across threads.
+
+    Streamlit sessions, the bulk CLI and background workers all write here;
+    `snapshot()` is for in-app reporting and `render_prometheus()` for scraping.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[LabelKey, float]] = defaultdict(dict)
+        self._gauges: dict[str, dict[LabelKey, float]] = defaultdict(dict)
+
+    def inc(self, name: str, value: float = 1.0, **labels: object) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters[name]
+            series[key] = series.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, **labels: object) -> None:
+        with self._lock:
+            self._gauges[name][_label_key(labels)] = value
+
+    def get(self, name: str, **labels: object) -> float:
+        key = _label_key(labels)
+        with self._lock:
+            if name in self._gauges:
+                return self._gauges[name].get(key, 0.0)
+            return self._counters.get(name, {}).get(key, 0.0)
+
+    def snapshot(self) -> dict[str, dict[LabelKey, float]]:
+        with self._lock:
+            merged = {name: dict(series) for name, series in self._counters.items()}
+            merged.update({name: dict(series) for name, series in self._gauges.items()})
+            return merged
+
+    def render_prometheus(self) -> str:
+        with self._lock:
+            blocks = [("counter", self._counters), ("gauge", self._gauges)]
+            lines: list[str] = []
+            for kind, store in blocks:
+                for name in sorted(store):
+                    lines.append(f"# TYPE {name} {kind}")
+                    for key, value in sorted(store[name].items()):
+                        labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+                        lines.append(f"{name}{{{labels}}} {value:g}" if labels else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+from src.config.settings import Settings, settings, validate_settings
+from src.prompts.templates import PromptTemplate, fill_blank_prompt_template, mcq_prompt_template
+
+logger = get_logger(__name__)
+
+# Settings that may be changed at runtime. Provider credentials, the provider
+# toggle and file locations stay pinned to the environment.
+RELOADABLE_SETTINGS = frozenset(
+    {
+        "groq_model",
+        "ollama_model",
+        "temperature",
+        "max_retries",
+        "max_concurrency",
+        "requests_per_second",
+        "request_timeout",
+        "session_token_budget",
+        "pod_token_budget",
+        "llm_cassette_speed",
+        "circuit_failure_rate",
+        "circuit_slow_call_seconds",
+        "circuit_open_seconds",
+        "circuit_min_calls",
+    }
+)
+
+PROMPT_VARIABLES = frozenset({"topic", "difficulty"})
+
+DEFAULT_PROMPTS: dict[str, PromptTemplate] = {
+    "mcq": mcq_prompt_template,
+    "fill_blank": fill_blank_prompt_template,
+}
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """
+    An immutable, versioned view of settings + prompts.
+
+    Everything derived from the config (currently the LLM client) is cached on
+    the snapshot itself, so publishing a new snapshot invalidates all of it in
+    one reference swap while requests holding the old snapshot keep using it.
+    """
+
+    version: int
+    settings: Settings
+    prompts: dict[str, PromptTemplate]
+    digest: str = ""
+    _cache: dict[str, Any] = field(default_factory=dict, repr=False, compare=False)
+    _cache_lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def mcq_prompt(self) -> PromptTemplate:
+        return self.prompts["mcq"]
+
+    @property
+    def fill_blank_prompt(self) -> PromptTemplate:
+        return self.prompts["fill_blank"]
+
+    def llm(self) -> Any:
+        """
+        LLM client for this version (created once, shared by its requests).
+        """
+        with self._cache_lock:
+            if "llm" not in self._cache:
+                # Local import: client_factory depends on settings, not on the registry.
+                from src.llm.client_factory import get_llm
+
+                self._cache["llm"] = get_llm(self.settings)
+            return self._cache["llm"]
+
+
+def _coerce(name: str, declared: str, value: Any) -> Any:
+    if declared == "float":
+        if isinstance(value, bool):
+            raise ValueError(f"{name} must be a number, got {value!r}")
+        return float(value)
+    if declared == "int":
+        number = float(value) if not isinstance(value, bool) else None
+        if number is None or not number.is_integer():
+            raise ValueError(f"{name} must be an integer, got {value!r}")
+        return int(number)
+    return str(value)
+
+
+def build_snapshot(version: int, overrides: dict[str, Any], base: Settings = settings) -> ConfigSnapshot:
+    """
+    Apply a JSON overrides document on top of the environment settings.
+
+    Format:
+        {
+          "settings": {"temperature": 0.5, "max_retries": 2, "max_concurrency": 8},
+          "prompts": {"mcq": "Generate a {difficulty} ... about {topic} ..."}
+        }
+    """
+    setting_overrides = dict(overrides.get("settings") or {})
+    unknown = set(setting_overrides) - RELOADABLE_SETTINGS
+    if unknown:
+        raise ValueError(f"Settings not reloadable at runtime: {sorted(unknown)}")
+
+    # Coerce to the declared field types so "0.5" / 2 both work; 2.7 for an
+    # int setting is rejected rather than truncated.
+    types = {f.name: f.type for f in dataclasses.fields(Settings)}
+    coerced = {k: _coerce(k, types[k], v) for k, v in setting_overrides.items()}
+    new_settings = validate_settings(dataclasses.replace(base, **coerced))
+
+    prompts = dict(DEFAULT_PROMPTS)
+    for name, template in (overrides.get("prompts") or {}).items():
+        if name not in DEFAULT_PROMPTS:
+            raise ValueError(f"Unknown prompt: {name!r}")
+        # Fail the reload now rather than on the first request.
+        prompt = PromptTemplate.from_template(template)
+        variables = set(prompt.input_variables)
+        if variables != PROMPT_VARIABLES:
+            raise ValueError(
+                f"Prompt {name!r} must use exactly {{topic}} and {{difficulty}}, got {sorted(variables)}"
+            )
+        prompt.format(topic="test", difficulty="medium")
+        prompts[name] = prompt
+
+    digest = hashlib.sha256(json.dumps(overrides, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+    return ConfigSnapshot(version, new_settings, prompts, digest)
+
+
+class ConfigRegistry:
+    """
+    Holds the current ConfigSnapshot and reloads it when the watched file changes.
+
+    - `current()` is cheap: a reference read, plus an mtime check at most every
+      `poll_interval` seconds.
+    - A reload that fails validation is logged and ignored; the previous version
+      stays active.
+    - Listeners run after each successful reload (e.g. to retune budgets).
+    """
+
+    def __init__(self, path: str | None, poll_interval: float = 2.0):
+        self.path = Path(path) if path else None
+        self.poll_interval = poll_interval
+
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[ConfigSnapshot], None]] = []
+        self._file_stamp: tuple[float, int] | None = None
+        self._last_check = 0.0
+        self._watcher: threading.Thread | None = None
+        self._snapshot = ConfigSnapshot(1, settings, dict(DEFAULT_PROMPTS))
+
+        if self.path is not None:
+            self.reload()
+
+    def current(self) -> ConfigSnapshot:
+        if self.path is not None and time.monotonic() - self._last_check >= self.poll_interval:
+            self.reload()
+        return self._snapshot
+
+    def subscribe(self, listener: Callable[[ConfigSnapshot], None]) -> None:
+        self._listeners.append(listener)
+
+    def _stamp(self) -> tuple[float, int] | None:
+        try:
+            st = self.path.stat()  # type: ignore[union-attr]
+        except OSError:
+            return None
+        return (st.st_mtime, st.st_size)
+
+    def reload(self, force: bool = False) -> ConfigSnapshot:
+        """
+        Re-read the watched file if it changed (or if `force`); returns the current snapshot.
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            stamp = self._stamp()
+            if not force and stamp == self._file_stamp:
+                return self._snapshot
+            self._file_stamp = stamp
+
+            try:
+                overrides = (
+                    json.loads(self.path.read_text(encoding="utf-8"))  # type: ignore[union-attr]
+                    if stamp is not None
+                    else {}
+                )
+                snapshot = build_snapshot(self._snapshot.version + 1, overrides)
+            except Exception as e:
+                metrics.inc("config_reload_failures_total")
+                logger.error(f"Ignoring invalid config file {self.path}: {e}")
+                return self._snapshot
+
+            if snapshot.digest == self._snapshot.digest:
+                return self._snapshot
+
+            self._snapshot = snapshot
+
+        metrics.set_gauge("config_version", snapshot.version)
+        logger.info(f"Loaded config version {snapshot.version} ({snapshot.digest}) from {self.path}")
+        for listener in list(self._listeners):
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Config listener failed: {e}")
+        return snapshot
+
+    def start_watcher(self) -> None:
+        """
+        Poll the file in a daemon thread so reloads happen even without traffic.
+        """
+        if self.path is None or self._watcher is not None:
+            return
+
+        def _watch() -> None:
+            while True:
+                time.sleep(self.poll_interval)
+                self.current()
+
+        self._watcher = threading.Thread(target=_watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+
+config_registry = ConfigRegistry(settings.config_file)
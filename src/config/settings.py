@@ -41,6 +41,33 @@ class Settings:
     temperature: float
     max_retries: int
 
+    # Throughput / rate limiting
+    max_concurrency: int
+    requests_per_second: float
+    request_timeout: float
+
+    # Token budgets (0 = unlimited); the pod budget resets daily (UTC)
+    session_token_budget: int
+    pod_token_budget: int
+
+    # LLM record/replay ("off", "record", "replay")
+    llm_cassette_mode: str
+    llm_cassette_path: str
+    llm_cassette_speed: float
+
+    # LLM circuit breaker (per backend) and health endpoint
+    circuit_failure_rate: float
+    circuit_slow_call_seconds: float
+    circuit_open_seconds: float
+    circuit_min_calls: int
+    health_port: int
+
+    # Pre-built question banks (JSONL from the bulk CLI) for adaptive selection
+    question_bank_paths: tuple[str, ...]
+
+    # Hot-reloadable overrides (settings + prompts), see src.config.registry
+    config_file: str | None
+
     @property
     def rag_model(self) -> str:
         return self.ollama_model if self.use_ollama else self.groq_model
@@ -58,6 +85,21 @@ def get_settings() -> Settings:
     - OLLAMA_BASE_URL
     - TEMPERATURE
     - MAX_RETRIES
+    - MAX_CONCURRENCY (parallel generation workers)
+    - REQUESTS_PER_SECOND (0 disables client-side rate limiting)
+    - REQUEST_TIMEOUT (seconds per LLM request)
+    - SESSION_TOKEN_BUDGET (tokens per user session, 0 = unlimited)
+    - POD_TOKEN_BUDGET (tokens per UTC day for this process/pod, 0 = unlimited)
+    - QUESTION_BANK_PATHS (comma-separated JSONL files)
+    - LLM_CASSETTE_MODE (off/record/replay)
+    - LLM_CASSETTE_PATH (SQLite file for recorded traffic)
+    - LLM_CASSETTE_SPEED (replay speed: 1 = original, >1 faster, 0 = no latency)
+    - CONFIG_FILE (JSON overrides watched and reloaded at runtime)
+    - CIRCUIT_FAILURE_RATE (error/slow-call rate that opens the breaker, 0..1)
+    - CIRCUIT_SLOW_CALL_SECONDS (latency counted as a slow call)
+    - CIRCUIT_OPEN_SECONDS (fail-fast period before probing again)
+    - CIRCUIT_MIN_CALLS (calls needed before the rate is evaluated)
+    - HEALTH_PORT (port for /healthz, /livez, /metrics; 0 disables)
     """
     load_dotenv()
 
@@ -69,9 +111,40 @@ def get_settings() -> Settings:
         ollama_base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434"),
         temperature=_to_float(os.getenv("TEMPERATURE", "0.9"), 0.9),
         max_retries=_to_int(os.getenv("MAX_RETRIES", "3"), 3),
+        max_concurrency=_to_int(os.getenv("MAX_CONCURRENCY", "4"), 4),
+        requests_per_second=_to_float(os.getenv("REQUESTS_PER_SECOND", "0"), 0.0),
+        request_timeout=_to_float(os.getenv("REQUEST_TIMEOUT", "60"), 60.0),
+        session_token_budget=_to_int(os.getenv("SESSION_TOKEN_BUDGET", "0"), 0),
+        pod_token_budget=_to_int(os.getenv("POD_TOKEN_BUDGET", "0"), 0),
+        question_bank_paths=tuple(
+            p.strip() for p in os.getenv("QUESTION_BANK_PATHS", "").split(",") if p.strip()
+        ),
+        llm_cassette_mode=os.getenv("LLM_CASSETTE_MODE", "off").strip().lower(),
+        llm_cassette_path=os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.sqlite"),
+        llm_cassette_speed=_to_float(os.getenv("LLM_CASSETTE_SPEED", "1"), 1.0),
+        config_file=os.getenv("CONFIG_FILE") or None,
+        circuit_failure_rate=_to_float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"), 0.5),
+        circuit_slow_call_seconds=_to_float(os.getenv("CIRCUIT_SLOW_CALL_SECONDS", "20"), 20.0),
+        circuit_open_seconds=_to_float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"), 30.0),
+        circuit_min_calls=_to_int(os.getenv("CIRCUIT_MIN_CALLS", "5"), 5),
+        health_port=_to_int(os.getenv("HEALTH_PORT", "8081"), 8081),
     )
 
-    if not s.use_ollama and not s.groq_api_key:
+    return validate_settings(s)
+
+
+def validate_settings(s: Settings) -> Settings:
+    """
+    Validate a Settings instance (from env or from runtime overrides).
+    """
+    if s.llm_cassette_mode not in {"off", "record", "replay"}:
+        raise RuntimeError("LLM_CASSETTE_MODE must be one of: off, record, replay")
+
+    if s.llm_cassette_speed < 0:
+        raise RuntimeError("LLM_CASSETTE_SPEED must be >= 0")
+
+    # Replay never talks to the provider, so no API key is needed.
+    if not s.use_ollama and not s.groq_api_key and s.llm_cassette_mode != "replay":
         raise RuntimeError("GROQ_API_KEY is required when USE_OLLAMA=false")
 
     # Typical model temperature range is 0..2 (many providers use 0..1).
@@ -81,6 +154,27 @@ def get_settings() -> Settings:
     if s.max_retries < 0:
         raise RuntimeError("MAX_RETRIES must be >= 0")
 
+    if s.max_concurrency < 1:
+        raise RuntimeError("MAX_CONCURRENCY must be >= 1")
+
+    if s.session_token_budget < 0 or s.pod_token_budget < 0:
+        raise RuntimeError("SESSION_TOKEN_BUDGET and POD_TOKEN_BUDGET must be >= 0")
+
+    if s.requests_per_second < 0:
+        raise RuntimeError("REQUESTS_PER_SECOND must be >= 0")
+
+    if s.request_timeout <= 0:
+        raise RuntimeError("REQUEST_TIMEOUT must be > 0")
+
+    if not (0.0 < s.circuit_failure_rate <= 1.0):
+        raise RuntimeError("CIRCUIT_FAILURE_RATE must be in (0, 1]")
+
+    if s.circuit_slow_call_seconds <= 0 or s.circuit_open_seconds <= 0:
+        raise RuntimeError("CIRCUIT_SLOW_CALL_SECONDS and CIRCUIT_OPEN_SECONDS must be > 0")
+
+    if s.circuit_min_calls < 1:
+        raise RuntimeError("CIRCUIT_MIN_CALLS must be >= 1")
+
     return s
 
 
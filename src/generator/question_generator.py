@@ -12,14 +12,32 @@ from pydantic import BaseModel
 
 from src.common.custom_exception import CustomException
 from src.common.logger import get_logger
-from src.config.settings import settings
-from src.llm.client_factory import get_llm
+from src.common.metrics import metrics
+from src.config.registry import ConfigSnapshot, config_registry
+from src.llm.circuit_breaker import CircuitOpenError, get_breaker
+from src.llm.client_factory import LLMClient
+from src.llm.usage import extract_usage, usage_tracker
 from src.models.question_schemas import FillBlankQuestion, MCQQuestion
-from src.prompts.templates import fill_blank_prompt_template, mcq_prompt_template
+from src.validation.question_checks import QuestionRejected, QuestionValidator
 
 class QuestionGenerator:
-    def __init__(self):
-        self.llm = get_llm()
+    def __init__(
+        self,
+        llm: LLMClient | None = None,
+        validator: QuestionValidator | None = None,
+        session_id: str = "default",
+        config: ConfigSnapshot | None = None,
+    ):
+        # Pin one config version for the generator's lifetime, so a hot reload
+        # never changes settings/prompts halfway through a quiz.
+        self.config = config if config is not None else config_registry.current()
+        # Callers (e.g. the bulk CLI) may pass a pre-configured client.
+        self.llm = llm if llm is not None else self.config.llm()
+        # Shared per backend, so every session sees the same provider health.
+        self.breaker = get_breaker(self.config.settings)
+        self.validator = validator if validator is not None else QuestionValidator()
+        # Token usage is attributed to this session (see src.llm.usage).
+        self.session_id = session_id
         self.logger = get_logger(self.__class__.__name__)
 
     def _retry_and_parse(
@@ -29,7 +47,7 @@ class QuestionGenerator:
         topic: str,
         difficulty: str,
     ) -> BaseModel:
-        max_retries = max(1, settings.max_retries)
+        max_retries = max(1, self.config.settings.max_retries)
         last_err: Exception | None = None
 
         for attempt in range(1, max_retries + 1):
@@ -39,18 +57,49 @@ class QuestionGenerator:
                     f"topic='{topic}', difficulty='{difficulty}'"
                 )
 
-                response = self.llm.invoke(prompt.format(topic=topic, difficulty=difficulty))
+                formatted = prompt.format(topic=topic, difficulty=difficulty)
+                response = self.breaker.call(lambda: self.llm.invoke(formatted))
+                usage_tracker.record(self.session_id, topic, attempt, extract_usage(response))
 
                 parsed = parser.parse(response.content)
 
+                # Cheap rule-based checks run before accepting the sample, so a
+                # bad question costs one extra call instead of a wasted session.
+                self.validator.validate(parsed)
+
+                usage_tracker.record_question()
                 self.logger.info("Successfully parsed the question")
                 return parsed
 
+            except CircuitOpenError:
+                # Backend is known to be down: skip the rest of the retry ladder.
+                metrics.inc("question_generation_failures_total", reason="circuit_open")
+                raise
+
+            except QuestionRejected as e:
+                last_err = e
+                self.logger.warning(f"Rejected generated question: {e}")
+
+                if not e.fixable:
+                    metrics.inc("question_generation_failures_total", reason="unfixable_reject")
+                    raise CustomException(
+                        "Generated question failed a non-retryable quality check", e
+                    ) from e
+
+                if attempt == max_retries:
+                    metrics.inc("question_generation_failures_total", reason="rejected")
+                    raise CustomException(
+                        f"Failed to generate a valid question after {max_retries} attempts",
+                        last_err,
+                    ) from last_err
+
             except Exception as e:
                 last_err = e
+                metrics.inc("question_attempt_errors_total", kind=type(e).__name__)
                 self.logger.error(f"Error generating/parsing question: {e}")
 
                 if attempt == max_retries:
+                    metrics.inc("question_generation_failures_total", reason="error")
                     raise CustomException(
                         f"Failed to generate question after {max_retries} attempts",
                         last_err,
@@ -63,12 +112,15 @@ class QuestionGenerator:
         try:
             parser = PydanticOutputParser(pydantic_object=MCQQuestion)
 
-            question = self._retry_and_parse(mcq_prompt_template, parser, topic, difficulty)
+            question = self._retry_and_parse(self.config.mcq_prompt, parser, topic, difficulty)
             
             self.logger.info(f"Generated MCQ: {question.question}")
 
             return question  # type: ignore[return-value]
-        
+
+        except CircuitOpenError:
+            # Unwrapped so callers can fall back (e.g. to the question bank).
+            raise
         except Exception as e:
             self.logger.error(f"Error generating MCQ question: {str(e)}")
             raise CustomException("MCQ generation failed", e) from e
@@ -77,15 +129,14 @@ class QuestionGenerator:
         try:
             parser = PydanticOutputParser(pydantic_object=FillBlankQuestion)
 
-            question = self._retry_and_parse(fill_blank_prompt_template, parser, topic, difficulty)
+            question = self._retry_and_parse(self.config.fill_blank_prompt, parser, topic, difficulty)
 
-            if "_____" not in question.question:
-                raise ValueError("Invalid fill blank question: question must contain '_____'")
-            
             self.logger.info(f"Generated fill-blank: {question.question}")
 
             return question  # type: ignore[return-value]
-        
+
+        except CircuitOpenError:
+            raise
         except Exception as e:
             self.logger.error(f"Error generating fill blank question: {str(e)}")
             raise CustomException("Fill blank generation failed", e) from e
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import cycle
+from typing import Iterable
+
+from src.common.logger import get_logger
+from src.generator.question_generator import QuestionGenerator
+
+logger = get_logger(__name__)
+
+MCQ = "Multiple Choice Question"
+FILL_BLANK = "Fill in the Blank"
+QUESTION_TYPES = (MCQ, FILL_BLANK)
+
+
+@dataclass(frozen=True)
+class QuizSpecItem:
+    """
+    `count` questions of one type about one topic.
+    """
+
+    question_type: str
+    topic: str
+    count: int
+    difficulty: str = "Medium"
+
+    def __post_init__(self) -> None:
+        if self.question_type not in QUESTION_TYPES:
+            raise ValueError(f"Unknown question type: {self.question_type!r}")
+        if not self.topic.strip():
+            raise ValueError("topic cannot be empty")
+        if self.count < 0:
+            raise ValueError("count must be >= 0")
+
+
+@dataclass(frozen=True)
+class QuizSpec:
+    """
+    Describes a (possibly mixed) quiz, e.g. 6 MCQ + 4 fill-blank across 3 subtopics.
+
+    Items are laid out in order; use `QuizSpec.mix` to interleave types and topics.
+    """
+
+    items: tuple[QuizSpecItem, ...]
+
+    @property
+    def total(self) -> int:
+        return sum(item.count for item in self.items)
+
+    @classmethod
+    def single(cls, question_type: str, topic: str, count: int, difficulty: str) -> "QuizSpec":
+        return cls((QuizSpecItem(question_type, topic, count, difficulty),))
+
+    @classmethod
+    def mix(
+        cls,
+        topics: Iterable[str],
+        type_counts: dict[str, int],
+        difficulty: str,
+    ) -> "QuizSpec":
+        """
+        Spread each type's count round-robin across topics, then interleave
+        the types so the quiz alternates instead of grouping by type.
+        """
+        topics = [t.strip() for t in topics if t.strip()]
+        if not topics:
+            raise ValueError("at least one topic is required")
+
+        per_type: list[list[tuple[str, str]]] = []
+        for qtype, count in type_counts.items():
+            topic_cycle = cycle(topics)
+            per_type.append([(qtype, next(topic_cycle)) for _ in range(count)])
+
+        items: list[QuizSpecItem] = []
+        for i in range(max((len(seq) for seq in per_type), default=0)):
+            for seq in per_type:
+                if i < len(seq):
+                    qtype, topic = seq[i]
+                    items.append(QuizSpecItem(qtype, topic, 1, difficulty))
+        return cls(tuple(items))
+
+
+@dataclass(frozen=True)
+class Slot:
+    """
+    One question position in the assembled quiz.
+    """
+
+    position: int
+    question_type: str
+    topic: str
+    difficulty: str
+
+    @property
+    def group_key(self) -> tuple[str, str, str]:
+        # Slots sharing a key render the exact same prompt.
+        return (self.question_type, self.topic, self.difficulty)
+
+
+def plan(spec: QuizSpec) -> list[Slot]:
+    """
+    Expand a spec into ordered slots.
+    """
+    slots: list[Slot] = []
+    for item in spec.items:
+        for _ in range(item.count):
+            slots.append(Slot(len(slots), item.question_type, item.topic, item.difficulty))
+    return slots
+
+
+def group_slots(slots: Iterable[Slot]) -> dict[tuple[str, str, str], list[Slot]]:
+    groups: dict[tuple[str, str, str], list[Slot]] = {}
+    for slot in slots:
+        groups.setdefault(slot.group_key, []).append(slot)
+    return groups
+
+
+def generate_question_dict(
+    generator: QuestionGenerator,
+    question_type: str,
+    topic: str,
+    difficulty: str,
+) -> dict:
+    """
+    Generate one question in the dict shape QuizManager stores.
+    """
+    if question_type == MCQ:
+        question = generator.generate_mcq(topic, difficulty)
+        return {
+            "type": MCQ,
+            "question": question.question,
+            "options": question.options,
+            "correct_answer": question.correct_answer,
+        }
+
+    question = generator.generate_fill_blank(topic, difficulty)
+    return {
+        "type": FILL_BLANK,
+        "question": question.question,
+        "correct_answer": question.answer,
+    }
+
+
+def _question_key(q: dict) -> str:
+    return " ".join(q["question"].lower().split())
+
+
+@dataclass
+class PlannerResult:
+    """
+    Questions generated per slot position, plus the slots that failed.
+    """
+
+    questions: dict[int, dict] = field(default_factory=dict)
+    failures: dict[int, Exception] = field(default_factory=dict)
+
+
+class QuizPlanner:
+    """
+    Dispatches slots to QuestionGenerator in parallel and assembles them in order.
+
+    Every slot is an independent call, so a mixed 10-question quiz costs about
+    the latency of the slowest single question (bounded by `max_workers` and the
+    shared rate limiter) instead of the sum. Slots of the same group render the
+    same prompt, so duplicates within a group are regenerated. A failing slot
+    does not discard the questions already generated for the other slots.
+    """
+
+    def __init__(self, generator: QuestionGenerator, max_workers: int | None = None):
+        self.generator = generator
+        self.max_workers = max_workers or generator.config.settings.max_concurrency
+
+    def _run(self, executor: ThreadPoolExecutor, slots: list[Slot]) -> PlannerResult:
+        futures = {
+            slot.position: executor.submit(
+                generate_question_dict, self.generator, slot.question_type, slot.topic, slot.difficulty
+            )
+            for slot in slots
+        }
+        result = PlannerResult()
+        for pos, fut in futures.items():
+            try:
+                result.questions[pos] = fut.result()
+            except Exception as e:
+                result.failures[pos] = e
+        return result
+
+    def generate(self, slots: list[Slot], existing: Iterable[dict] = ()) -> PlannerResult:
+        """
+        Generate every slot; successful slots are kept even if others fail.
+
+        `existing` are questions already in the quiz (e.g. served from the bank)
+        that generated ones must not duplicate.
+        """
+        result = PlannerResult()
+        if not slots:
+            return result
+
+        todo = list(slots)
+        waves = max(1, self.generator.config.settings.max_retries)
+        existing = list(existing)
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(slots))) as executor:
+            for wave in range(1, waves + 1):
+                batch = self._run(executor, todo)
+                result.questions.update(batch.questions)
+                for pos, err in batch.failures.items():
+                    # A failed regeneration keeps the earlier (duplicate) question.
+                    if pos not in result.questions:
+                        result.failures[pos] = err
+
+                seen = {_question_key(q) for q in existing}
+                todo = []
+                for slot in sorted(slots, key=lambda s: s.position):
+                    question = result.questions.get(slot.position)
+                    if question is None:
+                        continue
+                    key = _question_key(question)
+                    if key in seen:
+                        todo.append(slot)
+                    seen.add(key)
+
+                if not todo:
+                    break
+                if wave == waves:
+                    logger.warning(f"Keeping {len(todo)} duplicate question(s) after {waves} waves")
+                else:
+                    logger.info(f"Regenerating {len(todo)} duplicate question(s)")
+
+        if result.failures:
+            logger.error(f"{len(result.failures)} of {len(slots)} question(s) failed to generate")
+        return result
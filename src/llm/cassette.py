@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from langchain_core.messages import AIMessage
+from langchain_core.rate_limiters import BaseRateLimiter
+
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interactions (
+    prompt_hash TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    model TEXT NOT NULL,
+    prompt TEXT NOT NULL,
+    content TEXT NOT NULL,
+    usage_metadata TEXT,
+    response_metadata TEXT,
+    latency_s REAL NOT NULL,
+    recorded_at TEXT NOT NULL,
+    PRIMARY KEY (prompt_hash, seq)
+) WITHOUT ROWID
+"""
+
+
+def _prompt_text(prompt: Any) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    # Message lists / prompt values: fall back to their string form.
+    to_string = getattr(prompt, "to_string", None)
+    return to_string() if callable(to_string) else str(prompt)
+
+
+def prompt_hash(model: str, prompt: Any) -> str:
+    return hashlib.sha256(f"{model}\x1f{_prompt_text(prompt)}".encode("utf-8")).hexdigest()
+
+
+class CassetteStore:
+    """
+    Compact SQLite store of prompt -> response interactions, keyed by prompt hash.
+
+    Repeated prompts (same topic/difficulty) are stored as a sequence so replay
+    reproduces the variety of the recorded traffic. The primary key is the
+    lookup index, so a replay hit is a single B-tree probe.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # Other processes may hold the write lock briefly; wait instead of failing.
+        self._conn = sqlite3.connect(str(self.path), timeout=30.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def append(
+        self,
+        key: str,
+        model: str,
+        prompt: str,
+        message: AIMessage,
+        latency_s: float,
+    ) -> int:
+        with self._lock:
+            # BEGIN IMMEDIATE takes the write lock before reading MAX(seq), so
+            # several processes recording to one file (e.g. the app and
+            # study-buddy-bulk) cannot allocate the same seq.
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                (seq,) = self._conn.execute(
+                    "SELECT COALESCE(MAX(seq) + 1, 0) FROM interactions WHERE prompt_hash = ?", (key,)
+                ).fetchone()
+                self._conn.execute(
+                    "INSERT INTO interactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        seq,
+                        model,
+                        prompt,
+                        str(message.content),
+                        json.dumps(message.usage_metadata or {}, default=str),
+                        json.dumps(message.response_metadata or {}, default=str),
+                        latency_s,
+                        datetime.now(timezone.utc).isoformat(),
+                    ),
+                )
+            except BaseException:
+                self._conn.rollback()
+                raise
+            self._conn.commit()
+            return seq
+
+    def count(self, key: str) -> int:
+        with self._lock:
+            (n,) = self._conn.execute(
+                "SELECT COUNT(*) FROM interactions WHERE prompt_hash = ?", (key,)
+            ).fetchone()
+            return n
+
+    def get(self, key: str, seq: int) -> tuple[AIMessage, float] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, usage_metadata, response_metadata, latency_s "
+                "FROM interactions WHERE prompt_hash = ? AND seq = ?",
+                (key, seq),
+            ).fetchone()
+        if row is None:
+            return None
+
+        content, usage, response_md, latency_s = row
+        message = AIMessage(
+            content=content,
+            usage_metadata=json.loads(usage) or None,
+            response_metadata=json.loads(response_md),
+        )
+        return message, latency_s
+
+
+@lru_cache(maxsize=None)
+def get_cassette_store(path: str) -> CassetteStore:
+    # Share one connection per file across all generators in the process.
+    return CassetteStore(path)
+
+
+class CassetteLLM:
+    """
+    Record/replay wrapper exposing the `invoke` surface QuestionGenerator uses.
+
+    - mode="record": call the real client, store the response and its latency.
+    - mode="replay": serve stored responses without any network access, sleeping
+      `latency / speed` (speed=1 original timing, >1 accelerated, 0 no latency).
+      Repeated prompts cycle through their recorded responses.
+
+    `rate_limiter` is acquired before each call in both modes, outside the
+    timed section: recorded latency is provider time only, and replay applies
+    throttling live instead of baking recorded queueing delay into latency.
+    """
+
+    def __init__(
+        self,
+        store: CassetteStore,
+        model: str,
+        mode: str,
+        inner: Any = None,
+        speed: float = 1.0,
+        rate_limiter: BaseRateLimiter | None = None,
+    ):
+        if mode not in {"record", "replay"}:
+            raise ValueError(f"Unknown cassette mode: {mode!r}")
+        if mode == "record" and inner is None:
+            raise ValueError("Record mode needs a real LLM client to wrap")
+
+        self.store = store
+        self.model = model
+        self.mode = mode
+        self.inner = inner
+        self.speed = speed
+        self.rate_limiter = rate_limiter
+
+        self._cursor_lock = threading.Lock()
+        self._cursors: dict[str, int] = {}
+
+    def _next_seq(self, key: str, available: int) -> int:
+        with self._cursor_lock:
+            seq = self._cursors.get(key, 0)
+            self._cursors[key] = seq + 1
+        return seq % available
+
+    def invoke(self, prompt: Any, config: Any = None, **kwargs: Any) -> AIMessage:
+        key = prompt_hash(self.model, prompt)
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire(blocking=True)
+
+        if self.mode == "record":
+            start = time.perf_counter()
+            message = self.inner.invoke(prompt, config, **kwargs)
+            latency_s = time.perf_counter() - start
+            self.store.append(key, self.model, _prompt_text(prompt), message, latency_s)
+            return message
+
+        available = self.store.count(key)
+        if available == 0:
+            raise CustomException(f"No recorded response for prompt hash {key[:12]} (model={self.model})")
+
+        hit = self.store.get(key, self._next_seq(key, available))
+        assert hit is not None
+        message, latency_s = hit
+        if self.speed > 0:
+            time.sleep(latency_s / self.speed)
+        return message
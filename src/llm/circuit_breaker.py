@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, TypeVar
+
+from src.common.custom_exception import CustomException
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+from src.config.registry import ConfigSnapshot, config_registry
+from src.config.settings import Settings
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+_STATE_GAUGE = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(CustomException):
+    """
+    Raised instead of calling the backend while its circuit is open.
+    """
+
+    def __init__(self, backend: str, retry_after: float):
+        self.backend = backend
+        self.retry_after = retry_after
+        super().__init__(f"LLM backend '{backend}' is unavailable (circuit open, retry in {retry_after:.0f}s)")
+
+
+def backend_name(cfg: Settings) -> str:
+    provider = "ollama" if cfg.use_ollama else "groq"
+    return f"{provider}:{cfg.rag_model}"
+
+
+class CircuitBreaker:
+    """
+    Per-backend circuit breaker driven by error rate and latency.
+
+    - closed: calls flow; outcomes go into a sliding window of the last
+      `window_size` calls. Once `min_calls` are recorded, the breaker opens if
+      the failure rate or the slow-call rate (latency >= `slow_call_seconds`)
+      reaches `failure_rate_threshold`.
+    - open: calls fail fast with CircuitOpenError for `open_seconds`.
+    - half_open: up to `half_open_max_calls` probes are let through; all
+      succeeding closes the breaker, any failure re-opens it.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        failure_rate_threshold: float = 0.5,
+        slow_call_seconds: float = 20.0,
+        open_seconds: float = 30.0,
+        min_calls: int = 5,
+        window_size: int = 20,
+        half_open_max_calls: int = 2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self.min_calls = min_calls
+        self.half_open_max_calls = half_open_max_calls
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._window: deque[tuple[bool, bool]] = deque(maxlen=window_size)  # (failed, slow)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+        metrics.set_gauge("llm_circuit_state", _STATE_GAUGE[CLOSED], backend=name)
+
+    # --- State --------------------------------------------------------------
+
+    def _transition(self, state: str) -> None:
+        if state == self._state:
+            return
+        logger.warning(f"Circuit '{self.name}': {self._state} -> {state}")
+        self._state = state
+        metrics.inc("llm_circuit_transitions_total", backend=self.name, to=state)
+        metrics.set_gauge("llm_circuit_state", _STATE_GAUGE[state], backend=self.name)
+
+        if state == OPEN:
+            self._opened_at = self._clock()
+        elif state == HALF_OPEN:
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        else:
+            self._window.clear()
+
+    def _refresh(self) -> None:
+        if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._refresh()
+            return self._state
+
+    def peek_state(self) -> str:
+        """
+        Current state without side effects (for health reporting, so probes
+        never move the breaker from open to half-open themselves).
+        """
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == OPEN
+
+    def retry_after(self) -> float:
+        with self._lock:
+            if self._state != OPEN:
+                return 0.0
+            return max(0.0, self.open_seconds - (self._clock() - self._opened_at))
+
+    # --- Calls --------------------------------------------------------------
+
+    def before_call(self) -> None:
+        """
+        Reserve a call slot or raise CircuitOpenError (fail fast).
+        """
+        with self._lock:
+            self._refresh()
+            if self._state == OPEN:
+                metrics.inc("llm_circuit_rejected_total", backend=self.name)
+                retry_after = self.open_seconds - (self._clock() - self._opened_at)
+                raise CircuitOpenError(self.name, max(0.0, retry_after))
+            if self._state == HALF_OPEN:
+                if self._probes_in_flight >= self.half_open_max_calls:
+                    metrics.inc("llm_circuit_rejected_total", backend=self.name)
+                    raise CircuitOpenError(self.name, 0.0)
+                self._probes_in_flight += 1
+
+    def record(self, success: bool, latency_s: float) -> None:
+        slow = latency_s >= self.slow_call_seconds
+        with self._lock:
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if not success or slow:
+                    self._transition(OPEN)
+                    return
+                self._probe_successes += 1
+                if self._probe_successes >= self.half_open_max_calls:
+                    self._transition(CLOSED)
+                return
+
+            if self._state != CLOSED:
+                return
+
+            self._window.append((not success, slow))
+            if len(self._window) < self.min_calls:
+                return
+
+            n = len(self._window)
+            failure_rate = sum(failed for failed, _ in self._window) / n
+            slow_rate = sum(s for _, s in self._window) / n
+            if failure_rate >= self.failure_rate_threshold or slow_rate >= self.failure_rate_threshold:
+                logger.error(
+                    f"Circuit '{self.name}' opening: failure_rate={failure_rate:.0%}, "
+                    f"slow_rate={slow_rate:.0%} over {n} calls"
+                )
+                self._transition(OPEN)
+
+    def call(self, fn: Callable[[], T]) -> T:
+        self.before_call()
+        start = time.perf_counter()
+        try:
+            result = fn()
+        except Exception:
+            self.record(False, time.perf_counter() - start)
+            raise
+        self.record(True, time.perf_counter() - start)
+        return result
+
+    def configure(self, cfg: Settings) -> None:
+        with self._lock:
+            self.failure_rate_threshold = cfg.circuit_failure_rate
+            self.slow_call_seconds = cfg.circuit_slow_call_seconds
+            self.open_seconds = cfg.circuit_open_seconds
+            self.min_calls = cfg.circuit_min_calls
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(cfg: Settings) -> CircuitBreaker:
+    """
+    Process-wide breaker for the backend described by `cfg`.
+    """
+    name = backend_name(cfg)
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name)
+            breaker.configure(config_registry.current().settings)
+            _breakers[name] = breaker
+        return breaker
+
+
+def all_breakers() -> dict[str, CircuitBreaker]:
+    with _breakers_lock:
+        return dict(_breakers)
+
+
+def _apply_config(snapshot: ConfigSnapshot) -> None:
+    # Thresholds are live-tunable; breaker state is kept across reloads.
+    for breaker in all_breakers().values():
+        breaker.configure(snapshot.settings)
+
+
+config_registry.subscribe(_apply_config)
+
+
+def health_report() -> tuple[bool, dict[str, str]]:
+    """
+    (llm_available, {backend: state}); unavailable while any backend's circuit is open.
+    """
+    states = {name: breaker.peek_state() for name, breaker in all_breakers().items()}
+    return all(state != OPEN for state in states.values()), states
@@ -6,18 +6,39 @@ from langchain_groq import ChatGroq
 from langchain_ollama import ChatOllama
 
 from src.config.settings import Settings, settings
+from src.llm.cassette import CassetteLLM, get_cassette_store
 from src.llm.groq_client import get_groq_llm
 from src.llm.ollama_client import get_ollama_llm
+from src.llm.rate_limiter import get_rate_limiter
 
 
-LLMClient = Union[ChatGroq, ChatOllama]
+LLMClient = Union[ChatGroq, ChatOllama, CassetteLLM]
+
+
+def _get_provider_llm(cfg: Settings, *, rate_limited: bool = True) -> Union[ChatGroq, ChatOllama]:
+    if cfg.use_ollama:
+        return get_ollama_llm(cfg, rate_limited=rate_limited)
+    return get_groq_llm(cfg, rate_limited=rate_limited)
 
 
 def get_llm(cfg: Settings = settings) -> LLMClient:
     """
     Return the active LLM client based on configuration.
+
+    With LLM_CASSETTE_MODE=record/replay the client is wrapped so traffic is
+    captured to, or served from, the cassette store. The wrapper applies the
+    shared rate limiter itself (the provider client gets none), so recorded
+    latency excludes client-side throttling.
     """
-    if cfg.use_ollama:
-        return get_ollama_llm(cfg)
-    return get_groq_llm(cfg)
+    if cfg.llm_cassette_mode == "off":
+        return _get_provider_llm(cfg)
+
+    return CassetteLLM(
+        store=get_cassette_store(cfg.llm_cassette_path),
+        model=cfg.rag_model,
+        mode=cfg.llm_cassette_mode,
+        inner=_get_provider_llm(cfg, rate_limited=False) if cfg.llm_cassette_mode == "record" else None,
+        speed=cfg.llm_cassette_speed,
+        rate_limiter=get_rate_limiter(cfg),
+    )
 
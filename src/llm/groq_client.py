@@ -3,17 +3,21 @@ from __future__ import annotations
 from langchain_groq import ChatGroq
 
 from src.config.settings import Settings, settings
+from src.llm.rate_limiter import get_rate_limiter
 
 
-def get_groq_llm(cfg: Settings = settings) -> ChatGroq:
+def get_groq_llm(cfg: Settings = settings, *, rate_limited: bool = True) -> ChatGroq:
     """
     Create a Groq chat model client.
 
-    Uses values from `src.config.settings.settings` by default.
+    Uses values from `src.config.settings.settings` by default. With
+    `rate_limited=False` the caller applies the shared rate limiter itself.
     """
     return ChatGroq(
         api_key=cfg.groq_api_key,
         model=cfg.groq_model,
         temperature=cfg.temperature,
+        rate_limiter=get_rate_limiter(cfg) if rate_limited else None,
         max_retries=cfg.max_retries,
+        timeout=cfg.request_timeout,
     )
\ No newline at end of file
@@ -3,12 +3,15 @@ from __future__ import annotations
 from langchain_ollama import ChatOllama
 
 from src.config.settings import Settings, settings
+from src.llm.rate_limiter import get_rate_limiter
 
 
-def get_ollama_llm(cfg: Settings = settings) -> ChatOllama:
+def get_ollama_llm(cfg: Settings = settings, *, rate_limited: bool = True) -> ChatOllama:
     """
     Create an Ollama chat model client.
 
+    With `rate_limited=False` the caller applies the shared rate limiter itself.
+
     Note: `max_retries` is not a constructor argument for ChatOllama, so retries
     (if desired) should be implemented at the call layer.
     """
@@ -16,5 +19,7 @@ def get_ollama_llm(cfg: Settings = settings) -> ChatOllama:
         model=cfg.ollama_model,
         base_url=cfg.ollama_base_url,
         temperature=cfg.temperature,
+        rate_limiter=get_rate_limiter(cfg) if rate_limited else None,
+        client_kwargs={"timeout": cfg.request_timeout},
     )
 
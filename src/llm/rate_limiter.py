@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+from langchain_core.rate_limiters import InMemoryRateLimiter
+
+from src.config.settings import Settings, settings
+
+
+@lru_cache(maxsize=None)
+def _shared_rate_limiter(requests_per_second: float) -> InMemoryRateLimiter:
+    # One limiter per configured rate, shared by every client in the process,
+    # so parallel workers draw from the same request budget.
+    return InMemoryRateLimiter(
+        requests_per_second=requests_per_second,
+        check_every_n_seconds=0.05,
+        max_bucket_size=max(1.0, requests_per_second),
+    )
+
+
+def get_rate_limiter(cfg: Settings = settings) -> InMemoryRateLimiter | None:
+    """
+    Return the process-wide rate limiter, or None when REQUESTS_PER_SECOND is 0.
+    """
+    if cfg.requests_per_second <= 0:
+        return None
+    return _shared_rate_limiter(cfg.requests_per_second)
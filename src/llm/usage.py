@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import Any
+
+from src.common.metrics import metrics
+from src.config.registry import ConfigSnapshot, config_registry
+from src.topics.canonicalizer import normalize_topic
+
+# Prior for tokens spent per accepted question (prompt + output + failed attempts)
+# until the tracker has observed real traffic.
+DEFAULT_TOKENS_PER_QUESTION = 600
+
+# Bounds on the per-key breakdowns, so a long-lived pod does not grow without
+# limit as sessions come and go and users type free-form topics.
+DEFAULT_MAX_SESSIONS = 10_000
+DEFAULT_MAX_TOPICS = 1_000
+OTHER_TOPIC = "(other)"
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            self.input_tokens + other.input_tokens,
+            self.output_tokens + other.output_tokens,
+        )
+
+
+def extract_usage(response: Any) -> TokenUsage:
+    """
+    Read token usage from a ChatGroq / ChatOllama response.
+
+    Prefers LangChain's standardized `usage_metadata`, falling back to the
+    provider-specific `response_metadata` fields.
+    """
+    um = getattr(response, "usage_metadata", None) or {}
+    if um:
+        return TokenUsage(int(um.get("input_tokens", 0)), int(um.get("output_tokens", 0)))
+
+    md = getattr(response, "response_metadata", None) or {}
+    token_usage = md.get("token_usage") or {}  # Groq (OpenAI-style)
+    if token_usage:
+        return TokenUsage(
+            int(token_usage.get("prompt_tokens", 0)),
+            int(token_usage.get("completion_tokens", 0)),
+        )
+    if "prompt_eval_count" in md or "eval_count" in md:  # Ollama
+        return TokenUsage(int(md.get("prompt_eval_count", 0)), int(md.get("eval_count", 0)))
+
+    return TokenUsage()
+
+
+@dataclass(frozen=True)
+class BudgetDecision:
+    """
+    How many questions may be generated by the LLM right now.
+
+    mode:
+    - "full": the request fits the budget
+    - "reduced": only `allowed` of the requested questions fit
+    - "cache_only": no LLM generation; serve from the question bank
+    """
+
+    requested: int
+    allowed: int
+    mode: str
+    reason: str = ""
+
+
+class UsageTracker:
+    """
+    Thread-safe token accounting per session, per topic and per retry attempt,
+    with optional per-session and per-pod (daily) budgets.
+
+    Counters live in this process only: with N replicas the provider sees up
+    to N x `pod_budget` per day, so size it as quota / replicas.
+
+    Memory is bounded: sessions are kept in LRU order and the least recently
+    active is dropped beyond `max_sessions` (its session budget starts over if
+    it returns). Topics are keyed by `normalize_topic` and, once `max_topics`
+    distinct keys exist, further topics are pooled under "(other)".
+
+    Totals are mirrored to the shared metrics registry:
+    - `llm_calls_total{attempt}`
+    - `llm_tokens_total{direction, attempt}`
+    - `llm_tokens_today` (gauge, this process's daily window)
+    """
+
+    def __init__(
+        self,
+        session_budget: int = 0,
+        pod_budget: int = 0,
+        max_sessions: int = DEFAULT_MAX_SESSIONS,
+        max_topics: int = DEFAULT_MAX_TOPICS,
+    ):
+        self.session_budget = session_budget
+        self.pod_budget = pod_budget
+        self.max_sessions = max_sessions
+        self.max_topics = max_topics
+
+        self._lock = threading.Lock()
+        self._by_session: OrderedDict[str, TokenUsage] = OrderedDict()
+        self._by_topic: dict[str, TokenUsage] = {}
+        self._by_attempt: dict[int, TokenUsage] = {}
+        self._questions = 0
+        self._question_tokens = 0
+        self._day: date = self._today()
+        self._today_usage = TokenUsage()
+
+    @staticmethod
+    def _today() -> date:
+        return datetime.now(timezone.utc).date()
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day = today
+            self._today_usage = TokenUsage()
+
+    def record(self, session_id: str, topic: str, attempt: int, usage: TokenUsage) -> None:
+        """
+        Record one LLM call (successful or not).
+        """
+        with self._lock:
+            self._roll_day()
+            self._by_session[session_id] = self._by_session.get(session_id, TokenUsage()) + usage
+            self._by_session.move_to_end(session_id)
+            while len(self._by_session) > self.max_sessions:
+                self._by_session.popitem(last=False)
+                metrics.inc("llm_usage_sessions_evicted_total")
+
+            topic_key = normalize_topic(topic)
+            if topic_key not in self._by_topic and len(self._by_topic) >= self.max_topics:
+                topic_key = OTHER_TOPIC
+            self._by_topic[topic_key] = self._by_topic.get(topic_key, TokenUsage()) + usage
+            self._by_attempt[attempt] = self._by_attempt.get(attempt, TokenUsage()) + usage
+            self._today_usage = self._today_usage + usage
+            self._question_tokens += usage.total_tokens
+            today_total = self._today_usage.total_tokens
+
+        metrics.inc("llm_calls_total", attempt=attempt)
+        metrics.inc("llm_tokens_total", usage.input_tokens, direction="input", attempt=attempt)
+        metrics.inc("llm_tokens_total", usage.output_tokens, direction="output", attempt=attempt)
+        metrics.set_gauge("llm_tokens_today", today_total)
+
+    def record_question(self) -> None:
+        """
+        Mark one accepted question (used for the tokens-per-question estimate).
+        """
+        with self._lock:
+            self._questions += 1
+
+    def tokens_per_question(self) -> float:
+        with self._lock:
+            if self._questions == 0:
+                return float(DEFAULT_TOKENS_PER_QUESTION)
+            return self._question_tokens / self._questions
+
+    def session_usage(self, session_id: str) -> TokenUsage:
+        with self._lock:
+            return self._by_session.get(session_id, TokenUsage())
+
+    def topic_usage(self) -> dict[str, TokenUsage]:
+        with self._lock:
+            return dict(self._by_topic)
+
+    def attempt_usage(self) -> dict[int, TokenUsage]:
+        with self._lock:
+            return dict(self._by_attempt)
+
+    def today_usage(self) -> TokenUsage:
+        with self._lock:
+            self._roll_day()
+            return self._today_usage
+
+    def plan(self, session_id: str, requested: int) -> BudgetDecision:
+        """
+        Decide how many of `requested` questions may be LLM-generated.
+
+        Degrades gracefully instead of failing: the request is reduced to what
+        the remaining budget is expected to cover, down to cache-only.
+        """
+        if requested <= 0:
+            return BudgetDecision(requested, 0, "full")
+
+        remaining: list[tuple[int, str]] = []
+        if self.session_budget > 0:
+            used = self.session_usage(session_id).total_tokens
+            remaining.append((self.session_budget - used, "session token budget"))
+        if self.pod_budget > 0:
+            used = self.today_usage().total_tokens
+            remaining.append((self.pod_budget - used, "pod token budget"))
+
+        if not remaining:
+            return BudgetDecision(requested, requested, "full")
+
+        tokens_left, reason = min(remaining)
+        allowed = max(0, min(requested, int(tokens_left // self.tokens_per_question())))
+
+        if allowed == requested:
+            return BudgetDecision(requested, allowed, "full")
+
+        metrics.inc("llm_budget_degradations_total", mode="cache_only" if allowed == 0 else "reduced")
+        return BudgetDecision(requested, allowed, "cache_only" if allowed == 0 else "reduced", reason)
+
+    def apply_config(self, snapshot: ConfigSnapshot) -> None:
+        """
+        Registry listener: budgets are live-tunable.
+        """
+        self.session_budget = snapshot.settings.session_token_budget
+        self.pod_budget = snapshot.settings.pod_token_budget
+
+
+usage_tracker = UsageTracker()
+usage_tracker.apply_config(config_registry.current())
+config_registry.subscribe(usage_tracker.apply_config)
@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+import re
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Iterable
+
+import numpy as np
+
+from src.common.logger import get_logger
+from src.common.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Words that do not change what a quiz is about ("Python basics" == "Python").
+FILLER_WORDS = frozenset(
+    {
+        "a", "an", "the", "of", "to", "for", "in", "on", "and",
+        "basic", "basics", "intro", "introduction", "fundamental", "fundamentals",
+        "overview", "concept", "concepts", "beginner", "beginners", "101",
+        "programming", "language", "topic", "topics", "quiz", "questions",
+    }
+)
+_TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+# Tokens that make two otherwise similar topics different subjects:
+# "python 2" / "python 3", "world war I" / "world war II", "organic" / "inorganic".
+_ROMAN_RE = re.compile(r"^(?=[ivx])x{0,3}(ix|iv|v?i{0,3})$")
+NEGATING_PREFIXES = ("in", "non", "un", "anti", "dis", "ir", "im", "il")
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    Lowercase, tokenize and drop filler words; falls back to all tokens if
+    the topic consists only of filler (e.g. "Introduction").
+    """
+    tokens = _TOKEN_RE.findall(topic.lower())
+    core = [t for t in tokens if t not in FILLER_WORDS]
+    return " ".join(core or tokens)
+
+
+def _is_distinguishing(token: str) -> bool:
+    return any(c.isdigit() for c in token) or bool(_ROMAN_RE.match(token)) or token in NEGATING_PREFIXES
+
+
+def topics_conflict(a: frozenset[str], b: frozenset[str]) -> bool:
+    """
+    True if the token sets differ by a number, a roman numeral or a negating
+    prefix, which char n-gram similarity cannot see.
+    """
+    only_a, only_b = a - b, b - a
+    if any(_is_distinguishing(t) for t in only_a | only_b):
+        return True
+    return any(
+        x == p + y or y == p + x
+        for x in only_a
+        for y in only_b
+        for p in NEGATING_PREFIXES
+    )
+
+
+class HashingVectorizer:
+    """
+    CPU-only char n-gram + word feature hashing into a fixed-size, L2-normalized vector.
+
+    Deterministic across processes (crc32, not Python's salted `hash`).
+    """
+
+    def __init__(self, dim: int = 512, ngram_range: tuple[int, int] = (2, 4)):
+        self.dim = dim
+        self.ngram_range = ngram_range
+
+    def _features(self, text: str) -> Iterable[str]:
+        for word in text.split():
+            yield f"w:{word}"
+            padded = f" {word} "
+            lo, hi = self.ngram_range
+            for n in range(lo, hi + 1):
+                for i in range(len(padded) - n + 1):
+                    yield padded[i : i + n]
+
+    def transform(self, text: str) -> np.ndarray:
+        vec = np.zeros(self.dim, dtype=np.float32)
+        for feat in self._features(text):
+            h = zlib.crc32(feat.encode("utf-8"))
+            # Signed hashing keeps collisions from only ever adding similarity.
+            vec[h % self.dim] += 1.0 if (h >> 31) & 1 else -1.0
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm else vec
+
+
+class TopicIndex:
+    """
+    Maps free-text topics to canonical topic ids.
+
+    Lookup order:
+    1. exact hit on the normalized text (dict, O(1))
+    2. cosine similarity against all known canonical topics (one NumPy mat-vec);
+       the best match above `threshold` that does not conflict (see
+       `topics_conflict`) wins
+    3. otherwise the topic is its own canonical id; it is learned into the
+       index (incremental update) once it has been seen `min_count` times
+
+    Vectors live in a preallocated matrix that doubles when full, so adding a
+    topic is amortized O(dim). Memory is bounded: one-off topics are only
+    counted (in an LRU of at most `max_pending` keys) and never stored, and
+    beyond `max_topics` learned entries the least recently matched one is
+    evicted. Topics registered with `add` are never evicted.
+    """
+
+    def __init__(
+        self,
+        *,
+        threshold: float = 0.85,
+        vectorizer: HashingVectorizer | None = None,
+        initial_capacity: int = 256,
+        budget_ms: float = 1.0,
+        min_count: int = 2,
+        max_topics: int = 10_000,
+        max_pending: int = 10_000,
+    ):
+        self.threshold = threshold
+        self.vectorizer = vectorizer or HashingVectorizer()
+        self.budget_ms = budget_ms
+        self.min_count = max(1, min_count)
+        self.max_topics = max_topics
+        self.max_pending = max_pending
+
+        self._lock = threading.Lock()
+        self._vectors = np.zeros((initial_capacity, self.vectorizer.dim), dtype=np.float32)
+        self._last_used = np.zeros(initial_capacity, dtype=np.int64)
+        self._tick = 0
+        self._ids: list[str] = []
+        self._token_sets: list[frozenset[str]] = []
+        self._rows: dict[str, int] = {}
+        self._pinned: set[str] = set()
+        self._aliases: dict[str, str] = {}
+        self._alias_keys: dict[str, set[str]] = {}
+        self._pending: OrderedDict[str, int] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def canonical_ids(self) -> list[str]:
+        with self._lock:
+            return list(self._ids)
+
+    def _touch(self, row: int) -> None:
+        self._tick += 1
+        self._last_used[row] = self._tick
+
+    def _set_alias(self, key: str, canonical_id: str) -> None:
+        self._aliases[key] = canonical_id
+        self._alias_keys.setdefault(canonical_id, set()).add(key)
+
+    def _append(self, canonical_id: str, key: str, vec: np.ndarray) -> None:
+        n = len(self._ids)
+        if n >= self.max_topics and self._evict_coldest():
+            n -= 1
+        if n == self._vectors.shape[0]:
+            grown = np.zeros((n * 2, self._vectors.shape[1]), dtype=np.float32)
+            grown[:n] = self._vectors
+            self._vectors = grown
+            last_used = np.zeros(n * 2, dtype=np.int64)
+            last_used[:n] = self._last_used
+            self._last_used = last_used
+        self._vectors[n] = vec
+        self._ids.append(canonical_id)
+        self._token_sets.append(frozenset(key.split()))
+        self._rows[canonical_id] = n
+        self._touch(n)
+
+    def _evict_coldest(self) -> bool:
+        """
+        Drop the least recently matched learned topic (swap-remove, O(dim)).
+        """
+        n = len(self._ids)
+        last_used = self._last_used[:n].copy()
+        for cid in self._pinned:
+            last_used[self._rows[cid]] = np.iinfo(np.int64).max
+        row = int(np.argmin(last_used))
+        cid = self._ids[row]
+        if cid in self._pinned:
+            return False
+
+        last = n - 1
+        if row != last:
+            self._vectors[row] = self._vectors[last]
+            self._last_used[row] = self._last_used[last]
+            self._ids[row] = self._ids[last]
+            self._token_sets[row] = self._token_sets[last]
+            self._rows[self._ids[row]] = row
+        self._ids.pop()
+        self._token_sets.pop()
+        del self._rows[cid]
+        for key in self._alias_keys.pop(cid, ()):
+            self._aliases.pop(key, None)
+
+        metrics.inc("topic_index_evicted_total")
+        return True
+
+    def _observe_new(self, key: str, vec: np.ndarray) -> None:
+        """
+        Count an unmatched topic; learn it once it recurs `min_count` times.
+        """
+        count = self._pending.pop(key, 0) + 1
+        if count < self.min_count:
+            self._pending[key] = count
+            while len(self._pending) > self.max_pending:
+                self._pending.popitem(last=False)
+            return
+        self._append(key, key, vec)
+        self._set_alias(key, key)
+        metrics.inc("topic_index_new_total")
+
+    def add(self, topic: str, canonical_id: str | None = None) -> str:
+        """
+        Register a known topic (or an alias of an existing canonical id).
+        """
+        key = normalize_topic(topic)
+        with self._lock:
+            if key in self._aliases:
+                return self._aliases[key]
+            cid = canonical_id or key
+            if cid not in self._rows:
+                self._append(cid, key, self.vectorizer.transform(key))
+            self._pinned.add(cid)
+            self._pending.pop(key, None)
+            self._set_alias(key, cid)
+            return cid
+
+    def canonicalize(self, topic: str) -> str:
+        """
+        Return the canonical id for `topic`, learning it if it keeps coming back.
+        """
+        start = time.perf_counter()
+        key = normalize_topic(topic)
+        if not key:
+            return key
+
+        with self._lock:
+            cid = self._aliases.get(key) or (key if key in self._rows else None)
+            if cid is not None:
+                self._touch(self._rows[cid])
+            else:
+                vec = self.vectorizer.transform(key)
+                n = len(self._ids)
+                if n:
+                    sims = self._vectors[:n] @ vec
+                    tokens = frozenset(key.split())
+                    candidates = np.flatnonzero(sims >= self.threshold)
+                    for i in candidates[np.argsort(-sims[candidates])]:
+                        if not topics_conflict(tokens, self._token_sets[i]):
+                            cid = self._ids[i]
+                            self._touch(int(i))
+                            self._set_alias(key, cid)
+                            break
+                if cid is None:
+                    cid = key
+                    self._observe_new(key, vec)
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        metrics.inc("topic_canonicalize_total")
+        if elapsed_ms > self.budget_ms:
+            metrics.inc("topic_canonicalize_over_budget_total")
+            logger.debug(
+                f"Topic canonicalization took {elapsed_ms:.2f}ms "
+                f"(budget {self.budget_ms}ms, {len(self._ids)} topics)"
+            )
+        return cid
@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import math
 import os
 from datetime import datetime
 
 import pandas as pd
 import streamlit as st
 
+from src.adaptive.engine import DEFAULT_RATING, DIFFICULTY_RATINGS, AdaptiveEngine
 from src.generator.question_generator import QuestionGenerator
+from src.generator.quiz_planner import QuizPlanner, QuizSpec, Slot, group_slots, plan
+from src.llm.circuit_breaker import CircuitOpenError
+from src.llm.usage import usage_tracker
 
 def rerun():
     # Toggle a flag (sometimes useful for conditional logic) and explicitly rerun.
@@ -14,45 +19,144 @@ def rerun():
     st.rerun()
 
 class QuizManager:
-    def __init__(self):
+    def __init__(self, engine: AdaptiveEngine | None = None, user_id: str = "anonymous"):
         self.questions = []
         self.user_answers = []
         self.results = []
-    
+
+        # Optional adaptive engine: serves questions from the bank and learns from answers.
+        self.engine = engine
+        self.user_id = user_id
+        self.topic = ""
+        self._answers_recorded = False
+
     def generate_questions(self, generator: QuestionGenerator, topic: str, question_type:str, difficulty:str, num_questions:int):
-        
+        return self.generate_quiz(generator, QuizSpec.single(question_type, topic, num_questions, difficulty))
+
+    def generate_quiz(self, generator: QuestionGenerator, spec: QuizSpec) -> bool:
+        """
+        Assemble a (possibly mixed, multi-topic) quiz described by `spec`.
+
+        Slots are grouped by prompt (type, topic, difficulty): each group is served
+        from the bank first, then the shortfall of all groups is generated in
+        parallel and placed back in spec order.
+        """
         self.questions = []
         self.user_answers = []
         self.results = []
+        self.topic = spec.items[0].topic if spec.items else ""
+        self._answers_recorded = False
 
         try:
-            for _ in range(num_questions):
-                if question_type == "Multiple Choice Question":
-                    question = generator.generate_mcq(topic, difficulty.lower())
-
-                    self.questions.append(
-                        {
-                            "type": "Multiple Choice Question",
-                            "question": question.question,
-                            "options": question.options,
-                            "correct_answer": question.correct_answer,
-                        }
+            slots = plan(spec)
+            assembled: dict[int, dict] = {}
+            to_generate: list[Slot] = []
+
+            for (question_type, topic, difficulty), group in group_slots(slots).items():
+                served: list[dict] = []
+                prompt_difficulty = difficulty.lower()
+                if self.engine is not None:
+                    # "Adaptive" targets the learner's current rating; fixed labels target their anchor.
+                    if difficulty.lower() == "adaptive":
+                        target = self.engine.learner_rating(self.user_id, topic)
+                    else:
+                        target = DIFFICULTY_RATINGS.get(difficulty.lower(), DEFAULT_RATING)
+
+                    served = self.engine.select(self.user_id, topic, question_type, len(group), target_rating=target)
+                    prompt_difficulty = self.engine.difficulty_label(target)
+
+                for slot, question in zip(group, served):
+                    assembled[slot.position] = {**question, "topic": topic}
+                to_generate.extend(
+                    Slot(slot.position, question_type, topic, prompt_difficulty)
+                    for slot in group[len(served):]
+                )
+
+            # Only the shortfall the bank could not cover goes to the LLM, and only
+            # as much of it as the token budget allows.
+            budget = usage_tracker.plan(self.user_id, len(to_generate))
+            if budget.mode != "full":
+                if not assembled and budget.allowed == 0:
+                    st.warning(f"Token budget exhausted ({budget.reason}) and no saved questions match this quiz.")
+                    return False
+                st.info(
+                    f"Token budget limit ({budget.reason}): serving "
+                    f"{len(assembled) + budget.allowed} of {spec.total} questions."
+                )
+                # Slots are collected per group; keep the earliest spec positions so
+                # a reduced quiz stays mixed across types and topics.
+                to_generate = sorted(to_generate, key=lambda slot: slot.position)[:budget.allowed]
+
+            # Slots that generated successfully are kept even if others fail. While the
+            # backend's circuit is open, generation fails fast with CircuitOpenError
+            # instead of blocking this session behind a provider incident.
+            outcome = QuizPlanner(generator).generate(to_generate, existing=assembled.values())
+
+            for slot in to_generate:
+                question = outcome.questions.get(slot.position)
+                if question is None:
+                    continue
+                if self.engine is not None:
+                    question["item_id"] = self.engine.add_item(slot.topic, question, slot.difficulty)
+                question["topic"] = slot.topic
+                assembled[slot.position] = question
+
+            unavailable = next(
+                (e for e in outcome.failures.values() if isinstance(e, CircuitOpenError)), None
+            )
+            if unavailable is not None:
+                missing = [slot for slot in to_generate if slot.position not in assembled]
+                self._serve_from_bank_relaxed(missing, assembled)
+
+            failed = [slot for slot in to_generate if slot.position not in assembled]
+            if not assembled:
+                if unavailable is not None:
+                    retry_in = max(1, math.ceil(unavailable.retry_after))
+                    st.error(
+                        "⏳ The question provider is temporarily unavailable and no saved questions "
+                        f"match this quiz. Please retry in {retry_in}s."
                     )
+                elif failed:
+                    st.error(f"Error generating questions: {outcome.failures[failed[0].position]}")
                 else:
-                    question = generator.generate_fill_blank(topic, difficulty.lower())
-                    self.questions.append(
-                        {
-                            "type": "Fill in the Blank",
-                            "question": question.question,
-                            "correct_answer": question.answer,
-                        }
-                    )
+                    st.error("No questions could be generated for this quiz.")
+                return False
+            if unavailable is not None:
+                st.warning(
+                    "⚠️ The question provider is temporarily unavailable: serving "
+                    f"{len(assembled)} of {spec.total} questions, completed from saved questions."
+                )
+            elif failed:
+                st.warning(
+                    f"⚠️ {len(failed)} of {spec.total} questions could not be generated and were skipped."
+                )
 
+            self.questions = [assembled[pos] for pos in sorted(assembled)]
+            if self.engine is not None:
+                for question in self.questions:
+                    if "item_id" in question:
+                        self.engine.mark_seen(self.user_id, question["topic"], [question["item_id"]])
             return True
         except Exception as e:
             st.error(f"Error generating questions: {e}")
             return False
 
+    def _serve_from_bank_relaxed(self, slots: list[Slot], assembled: dict[int, dict]) -> None:
+        """
+        Fill `slots` with any matching bank question (any rating, seen or not).
+        """
+        if self.engine is None:
+            return
+
+        used = {q["item_id"] for q in assembled.values() if "item_id" in q}
+        for (question_type, topic, _), group in group_slots(slots).items():
+            served = self.engine.select(
+                self.user_id, topic, question_type, len(group), exclude=used, relaxed=True
+            )
+            for slot, question in zip(group, served):
+                assembled[slot.position] = {**question, "topic": topic}
+                used.add(question["item_id"])
+
     
     def attempt_quiz(self):
         # Recompute answers from widget state on every rerun (avoid duplicates).
@@ -103,6 +207,15 @@ class QuizManager:
 
             self.results.append(result_dict)
 
+        # Feed outcomes back into item/learner ratings once per quiz.
+        if self.engine is not None and not self._answers_recorded:
+            for q, result in zip(self.questions, self.results):
+                if "item_id" in q:
+                    self.engine.record_answer(
+                        self.user_id, q.get("topic", self.topic), q["item_id"], result["is_correct"]
+                    )
+            self._answers_recorded = True
+
     def generate_result_dataframe(self):
         if not self.results:
             return pd.DataFrame()
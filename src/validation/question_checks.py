@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Callable, Iterable
+
+from pydantic import BaseModel
+
+from src.common.metrics import metrics
+from src.models.question_schemas import FillBlankQuestion, MCQQuestion
+
+# A check inspects a parsed question and returns a human-readable reason when
+# the question should be rejected, or None when it passes.
+CheckFn = Callable[[BaseModel], "str | None"]
+
+_BLANK_RE = re.compile(r"_{3,}")
+_CATCH_ALL_RE = re.compile(
+    r"^(all|none|both|neither)( of)? (the )?(above|these|of the above|a and b)\.?$",
+    re.IGNORECASE,
+)
+
+
+@dataclass(frozen=True)
+class QuestionCheck:
+    """
+    A cheap, rule-based quality check.
+
+    `fixable=True` means a fresh LLM sample is likely to pass, so the retry loop
+    regenerates. `fixable=False` means regenerating with the same prompt is a
+    waste of calls, so the retry loop gives up immediately.
+
+    The built-in checks all catch sampling defects and are fixable;
+    `fixable=False` is for registered checks whose failure is determined by
+    the input (e.g. a topic or prompt policy check).
+    """
+
+    name: str
+    applies_to: tuple[type[BaseModel], ...]
+    fn: CheckFn
+    fixable: bool = True
+
+
+@dataclass(frozen=True)
+class Rejection:
+    check: str
+    reason: str
+    fixable: bool
+
+
+class QuestionRejected(ValueError):
+    """
+    Raised when a parsed question fails one or more quality checks.
+    """
+
+    def __init__(self, rejections: list[Rejection]):
+        self.rejections = rejections
+        super().__init__("; ".join(f"{r.check}: {r.reason}" for r in rejections))
+
+    @property
+    def fixable(self) -> bool:
+        return all(r.fixable for r in self.rejections)
+
+
+def _norm(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _mentions(text: str, phrase: str) -> bool:
+    phrase = _norm(phrase)
+    # Lookarounds instead of \b so phrases starting/ending with a non-word
+    # character ("C++", "C#", ".NET") still match as whole terms; "+" and "#"
+    # count as part of a term so "C" does not match inside "C++".
+    pattern = rf"(?<![\w+#]){re.escape(phrase)}(?![\w+#])"
+    return bool(phrase) and re.search(pattern, _norm(text)) is not None
+
+
+# --- Built-in checks -------------------------------------------------------
+
+
+def check_duplicate_options(q: BaseModel) -> str | None:
+    assert isinstance(q, MCQQuestion)
+    normalized = [_norm(opt) for opt in q.options]
+    if len(set(normalized)) != len(normalized):
+        return "options contain duplicates"
+    return None
+
+
+def check_catch_all_option(q: BaseModel) -> str | None:
+    assert isinstance(q, MCQQuestion)
+    for opt in q.options:
+        if _CATCH_ALL_RE.match(opt.strip()):
+            return f"catch-all option '{opt}'"
+    return None
+
+
+def check_mcq_answer_leakage(q: BaseModel) -> str | None:
+    assert isinstance(q, MCQQuestion)
+    # Only a leak if the answer is the *only* option named in the question;
+    # "Which is larger, X or Y?" legitimately mentions several options.
+    mentioned = [opt for opt in q.options if _mentions(q.question, opt)]
+    if mentioned == [q.correct_answer]:
+        return "correct answer appears in the question text"
+    return None
+
+
+def check_single_blank(q: BaseModel) -> str | None:
+    assert isinstance(q, FillBlankQuestion)
+    blanks = len(_BLANK_RE.findall(q.question))
+    if blanks == 0:
+        return "question must contain '_____'"
+    if blanks > 1:
+        return f"question contains {blanks} blanks, expected 1"
+    return None
+
+
+def check_fill_blank_answer_leakage(q: BaseModel) -> str | None:
+    assert isinstance(q, FillBlankQuestion)
+    if _mentions(_BLANK_RE.sub(" ", q.question), q.answer):
+        return "answer appears in the question text"
+    return None
+
+
+DEFAULT_CHECKS: list[QuestionCheck] = [
+    QuestionCheck("mcq_duplicate_options", (MCQQuestion,), check_duplicate_options),
+    QuestionCheck("mcq_catch_all_option", (MCQQuestion,), check_catch_all_option),
+    QuestionCheck("mcq_answer_leakage", (MCQQuestion,), check_mcq_answer_leakage),
+    QuestionCheck("fill_blank_single_blank", (FillBlankQuestion,), check_single_blank),
+    QuestionCheck("fill_blank_answer_leakage", (FillBlankQuestion,), check_fill_blank_answer_leakage),
+]
+
+
+def register_check(check: QuestionCheck) -> None:
+    """
+    Add a check to the default pipeline (replaces an existing check with the same name).
+    """
+    DEFAULT_CHECKS[:] = [c for c in DEFAULT_CHECKS if c.name != check.name] + [check]
+
+
+class QuestionValidator:
+    """
+    Runs quality checks against a parsed question and records per-check stats.
+
+    Metrics:
+    - `question_checks_total{check}`: questions evaluated by a check
+    - `question_rejects_total{check}`: questions rejected by a check
+    """
+
+    def __init__(self, checks: Iterable[QuestionCheck] | None = None):
+        self._checks = list(checks) if checks is not None else None
+
+    @property
+    def checks(self) -> list[QuestionCheck]:
+        # Default to the live registry so `register_check` affects existing validators.
+        return self._checks if self._checks is not None else DEFAULT_CHECKS
+
+    def evaluate(self, question: BaseModel) -> list[Rejection]:
+        rejections: list[Rejection] = []
+        for check in self.checks:
+            if not isinstance(question, check.applies_to):
+                continue
+            metrics.inc("question_checks_total", check=check.name)
+            reason = check.fn(question)
+            if reason is not None:
+                metrics.inc("question_rejects_total", check=check.name)
+                rejections.append(Rejection(check.name, reason, check.fixable))
+        return rejections
+
+    def validate(self, question: BaseModel) -> BaseModel:
+        rejections = self.evaluate(question)
+        if rejections:
+            raise QuestionRejected(rejections)
+        return question
+
+
+def reject_rates() -> dict[str, tuple[int, int, float]]:
+    """
+    Return `{check: (evaluated, rejected, reject_rate)}` from the metrics registry.
+    """
+    snap = metrics.snapshot()
+    evaluated = snap.get("question_checks_total", {})
+    rejected = snap.get("question_rejects_total", {})
+
+    out: dict[str, tuple[int, int, float]] = {}
+    for key, total in evaluated.items():
+        name = dict(key)["check"]
+        bad = rejected.get(key, 0.0)
+        out[name] = (int(total), int(bad), bad / total if total else 0.0)
+    return out
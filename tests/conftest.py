@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+# src.config.settings validates the environment at import time; tests never
+# call the provider, so a placeholder key is enough.
+os.environ.setdefault("GROQ_API_KEY", "test-key")
+# src.common.logger picks its directory at import time; keep test logs out of the repo.
+os.environ.setdefault("LOGS_DIR", tempfile.mkdtemp(prefix="study-buddy-test-logs-"))
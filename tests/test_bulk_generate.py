@@ -0,0 +1,90 @@
+import json
+
+import src.cli.bulk_generate as bulk
+from src.cli.bulk_generate import Job, load_completed, load_manifest
+from src.llm.circuit_breaker import CircuitOpenError
+
+DEFAULTS = {"difficulties": ["easy"], "question_types": ["mcq"], "per_combo": 1}
+
+
+def _record(job_id: str) -> bytes:
+    return (json.dumps({"job_id": job_id, "question": "Q"}) + "\n").encode("utf-8")
+
+
+def test_load_completed_missing_file(tmp_path):
+    assert load_completed(tmp_path / "out.jsonl") == set()
+
+
+def test_load_completed_reads_job_ids(tmp_path):
+    out = tmp_path / "out.jsonl"
+    out.write_bytes(_record("a") + _record("b"))
+    assert load_completed(out) == {"a", "b"}
+    assert out.read_bytes() == _record("a") + _record("b")
+
+
+def test_load_completed_truncates_partial_tail(tmp_path):
+    out = tmp_path / "out.jsonl"
+    out.write_bytes(_record("a") + b'{"job_id": "b", "quest')
+    assert load_completed(out) == {"a"}
+    assert out.read_bytes() == _record("a")
+
+
+def test_load_completed_keeps_records_after_corrupt_line(tmp_path):
+    out = tmp_path / "out.jsonl"
+    out.write_bytes(_record("a") + b"not json\n" + _record("c") + b'{"job_id": "d"')
+    assert load_completed(out) == {"a", "c"}
+    assert out.read_bytes() == _record("a") + _record("c")
+    assert (tmp_path / "out.jsonl.rejects").read_bytes() == b"not json\n"
+
+
+def test_load_manifest_txt(tmp_path):
+    manifest = tmp_path / "topics.txt"
+    manifest.write_text("# syllabus\nPython\n\nChemistry\n")
+    jobs = load_manifest(manifest, **DEFAULTS)
+    assert jobs == [Job("Python", "easy", "mcq", 0), Job("Chemistry", "easy", "mcq", 0)]
+
+
+def test_load_manifest_json_overrides(tmp_path):
+    manifest = tmp_path / "topics.json"
+    manifest.write_text(json.dumps(
+        ["Python", {"topic": "SQL", "difficulties": ["Hard"], "question_types": ["fill_blank"], "count": 2}]
+    ))
+    jobs = load_manifest(manifest, **DEFAULTS)
+    assert [j.job_id for j in jobs] == [
+        "Python|easy|mcq|0",
+        "SQL|hard|fill_blank|0",
+        "SQL|hard|fill_blank|1",
+    ]
+
+
+def test_run_aborts_after_outage_and_leaves_jobs_for_resume(tmp_path, monkeypatch):
+    def unavailable(job):
+        raise CircuitOpenError("test", 0.0)
+
+    monkeypatch.setattr(bulk, "generate_record", unavailable)
+    jobs = [Job(f"t{i}", "easy", "mcq", 0) for i in range(50)]
+    out = tmp_path / "out.jsonl"
+
+    stats = bulk.run(jobs, out, concurrency=2, max_outage_s=0.0)
+    assert stats.aborted
+    assert stats.generated == 0 and stats.failed == 0
+    assert load_completed(out) == set()
+
+
+def test_run_requeues_jobs_rejected_by_open_circuit(tmp_path, monkeypatch):
+    rejected: set[str] = set()
+
+    def flaky(job):
+        if job.job_id not in rejected:
+            rejected.add(job.job_id)
+            raise CircuitOpenError("test", 0.0)
+        return {"job_id": job.job_id, "question": "Q"}
+
+    monkeypatch.setattr(bulk, "generate_record", flaky)
+    monkeypatch.setattr(bulk, "MIN_CIRCUIT_PAUSE_S", 0.01)
+    jobs = [Job(f"t{i}", "easy", "mcq", 0) for i in range(5)]
+    out = tmp_path / "out.jsonl"
+
+    stats = bulk.run(jobs, out, concurrency=5)
+    assert (stats.generated, stats.failed, stats.aborted) == (5, 0, False)
+    assert load_completed(out) == {job.job_id for job in jobs}
@@ -0,0 +1,96 @@
+import pytest
+
+from src.topics.canonicalizer import TopicIndex, normalize_topic, topics_conflict
+
+MERGE = [
+    ("python", "Python basics"),
+    ("python", "Python programming"),
+    ("machine learning", "machine-learning"),
+    ("machine learning", "machine learnin"),
+    ("neural networks", "neural network"),
+    ("data structures", "data structure"),
+]
+
+SEPARATE = [
+    ("organic chemistry", "inorganic chemistry"),
+    ("world war I", "world war II"),
+    ("python 2", "python 3"),
+    ("calculus 1", "calculus 2"),
+    ("linear equations", "nonlinear equations"),
+    ("linear equations", "non-linear equations"),
+    ("java", "javascript"),
+]
+
+
+def _learn(index: TopicIndex, topic: str) -> str:
+    # Topics are only learned into the index once they recur.
+    for _ in range(index.min_count - 1):
+        index.canonicalize(topic)
+    return index.canonicalize(topic)
+
+
+@pytest.mark.parametrize(("first", "second"), MERGE)
+def test_variants_merge(first, second):
+    index = TopicIndex()
+    assert _learn(index, first) == index.canonicalize(second)
+
+
+@pytest.mark.parametrize(("first", "second"), SEPARATE)
+def test_distinct_topics_stay_separate(first, second):
+    index = TopicIndex()
+    assert _learn(index, first) != index.canonicalize(second)
+    # Order must not matter either.
+    index = TopicIndex()
+    assert _learn(index, second) != index.canonicalize(first)
+
+
+def test_conflicting_match_falls_through_to_next_candidate():
+    index = TopicIndex()
+    index.add("world war II")
+    index.add("world war")
+    assert index.canonicalize("world war") == "world war"
+    assert index.canonicalize("world war I") not in {"world war II", "world war"}
+
+
+def test_topics_conflict():
+    assert topics_conflict(frozenset({"python", "2"}), frozenset({"python", "3"}))
+    assert topics_conflict(frozenset({"war", "i"}), frozenset({"war", "ii"}))
+    assert topics_conflict(frozenset({"organic"}), frozenset({"inorganic"}))
+    assert not topics_conflict(frozenset({"neural", "networks"}), frozenset({"neural", "network"}))
+
+
+def test_normalize_drops_filler_words():
+    assert normalize_topic("Introduction to Python basics") == "python"
+    assert normalize_topic("Introduction") == "introduction"
+
+
+def test_alias_and_add():
+    index = TopicIndex()
+    assert index.add("JS", canonical_id="javascript") == "javascript"
+    assert index.canonicalize("js") == "javascript"
+    assert len(index) == 1
+
+
+def test_one_off_topics_are_not_learned():
+    index = TopicIndex(min_count=2, max_pending=2)
+    assert index.canonicalize("quantum chromodynamics") == "quantum chromodynamics"
+    assert len(index) == 0
+    assert index.canonicalize("quantum chromodynamics") == "quantum chromodynamics"
+    assert len(index) == 1
+
+    for topic in ("alpha", "beta", "gamma"):
+        index.canonicalize(topic)
+    assert len(index._pending) == 2
+
+
+def test_learned_topics_are_capped_and_cold_ones_evicted():
+    index = TopicIndex(min_count=1, max_topics=2)
+    index.add("python")  # pinned
+    index.canonicalize("chemistry")
+    index.canonicalize("geology")  # evicts "chemistry", never "python"
+
+    assert sorted(index.canonical_ids) == ["geology", "python"]
+    assert index.canonicalize("python basics") == "python"
+    # The evicted topic is relearned from scratch, without stale aliases.
+    index.canonicalize("chemistry")
+    assert sorted(index.canonical_ids) == ["chemistry", "python"]
@@ -0,0 +1,83 @@
+import threading
+import time
+
+import pytest
+from langchain_core.messages import AIMessage
+
+from src.common.custom_exception import CustomException
+from src.llm.cassette import CassetteLLM, CassetteStore, prompt_hash
+
+
+class EchoLLM:
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt, config=None, **kwargs):
+        self.calls += 1
+        return AIMessage(content=f"{prompt} #{self.calls}")
+
+
+def test_record_then_replay_cycles_responses(tmp_path):
+    store = CassetteStore(tmp_path / "llm.sqlite")
+    recorder = CassetteLLM(store, "m", "record", inner=EchoLLM())
+    assert recorder.invoke("q").content == "q #1"
+    assert recorder.invoke("q").content == "q #2"
+
+    player = CassetteLLM(store, "m", "replay", speed=0)
+    assert [player.invoke("q").content for _ in range(3)] == ["q #1", "q #2", "q #1"]
+
+
+def test_replay_miss_raises(tmp_path):
+    player = CassetteLLM(CassetteStore(tmp_path / "llm.sqlite"), "m", "replay", speed=0)
+    with pytest.raises(CustomException):
+        player.invoke("never recorded")
+
+
+def test_concurrent_writers_to_one_file_get_unique_seqs(tmp_path):
+    # Separate stores = separate connections and locks, like separate processes.
+    path = tmp_path / "llm.sqlite"
+    stores = [CassetteStore(path) for _ in range(4)]
+    seqs: list[int] = []
+    seqs_lock = threading.Lock()
+
+    def record(store: CassetteStore) -> None:
+        for _ in range(50):
+            seq = store.append("k", "m", "p", AIMessage(content="x"), 0.0)
+            with seqs_lock:
+                seqs.append(seq)
+
+    threads = [threading.Thread(target=record, args=(s,)) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert sorted(seqs) == list(range(200))
+    assert stores[0].count("k") == 200
+
+
+class SlowLimiter:
+    def __init__(self, wait: float):
+        self.wait = wait
+        self.acquired = 0
+
+    def acquire(self, *, blocking: bool = True) -> bool:
+        self.acquired += 1
+        time.sleep(self.wait)
+        return True
+
+
+def test_recorded_latency_excludes_rate_limiter_wait(tmp_path):
+    store = CassetteStore(tmp_path / "llm.sqlite")
+    limiter = SlowLimiter(0.2)
+    recorder = CassetteLLM(store, "m", "record", inner=EchoLLM(), rate_limiter=limiter)
+    recorder.invoke("q")
+
+    _, latency_s = store.get(prompt_hash("m", "q"), 0)
+    assert limiter.acquired == 1
+    assert latency_s < 0.1
+
+    # Replay applies the limiter live too.
+    player = CassetteLLM(store, "m", "replay", speed=0, rate_limiter=limiter)
+    player.invoke("q")
+    assert limiter.acquired == 2
@@ -0,0 +1,136 @@
+import pytest
+
+from src.llm.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock() -> FakeClock:
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock: FakeClock) -> CircuitBreaker:
+    return CircuitBreaker(
+        "test",
+        failure_rate_threshold=0.5,
+        slow_call_seconds=10.0,
+        open_seconds=30.0,
+        min_calls=4,
+        window_size=10,
+        half_open_max_calls=2,
+        clock=clock,
+    )
+
+
+def _trip(breaker: CircuitBreaker) -> None:
+    for _ in range(4):
+        breaker.record(False, 0.1)
+
+
+def test_stays_closed_below_min_calls(breaker):
+    for _ in range(3):
+        breaker.record(False, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_stays_closed_below_failure_rate(breaker):
+    for ok in (True, True, True, False, True, True, False):
+        breaker.record(ok, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_opens_on_failure_rate(breaker):
+    _trip(breaker)
+    assert breaker.state == OPEN
+    assert breaker.is_open
+
+
+def test_opens_on_slow_call_rate(breaker):
+    for _ in range(4):
+        breaker.record(True, 12.0)
+    assert breaker.state == OPEN
+
+
+def test_open_fails_fast_with_retry_after(breaker, clock):
+    _trip(breaker)
+    clock.advance(10)
+    calls = []
+    with pytest.raises(CircuitOpenError) as exc:
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert exc.value.retry_after == pytest.approx(20.0)
+    assert breaker.retry_after() == pytest.approx(20.0)
+
+
+def test_half_open_after_open_seconds(breaker, clock):
+    _trip(breaker)
+    clock.advance(29.9)
+    assert breaker.state == OPEN
+    clock.advance(0.1)
+    assert breaker.state == HALF_OPEN
+
+
+def test_half_open_limits_probes(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+    breaker.before_call()
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_half_open_successes_close(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+    assert breaker.call(lambda: "a") == "a"
+    assert breaker.state == HALF_OPEN
+    assert breaker.call(lambda: "b") == "b"
+    assert breaker.state == CLOSED
+    # The failure window starts fresh after closing.
+    breaker.record(False, 0.1)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_failure_reopens(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+
+    def boom():
+        raise RuntimeError("provider down")
+
+    with pytest.raises(RuntimeError):
+        breaker.call(boom)
+    assert breaker.state == OPEN
+    assert breaker.retry_after() == pytest.approx(30.0)
+
+
+def test_half_open_slow_probe_reopens(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+    breaker.before_call()
+    breaker.record(True, 15.0)
+    assert breaker.state == OPEN
+
+
+def test_peek_state_has_no_side_effects(breaker, clock):
+    _trip(breaker)
+    clock.advance(30)
+    assert breaker.peek_state() == HALF_OPEN
+    assert breaker._state == OPEN
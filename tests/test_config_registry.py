@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from src.config.registry import ConfigRegistry, build_snapshot
+
+
+def test_overrides_are_applied():
+    snap = build_snapshot(
+        2,
+        {
+            "settings": {"temperature": "0.5", "max_retries": 2, "max_concurrency": 6.0},
+            "prompts": {"mcq": "Ask a {difficulty} question about {topic}. Reply as JSON: {{...}}"},
+        },
+    )
+    assert snap.settings.temperature == 0.5
+    assert snap.settings.max_retries == 2
+    assert snap.settings.max_concurrency == 6
+    assert snap.mcq_prompt.format(topic="t", difficulty="easy").startswith("Ask a easy question")
+
+
+@pytest.mark.parametrize(
+    "template",
+    ["no vars at all", "about {topic}", "{topic} {difficulty} {extra}"],
+)
+def test_prompt_must_use_exactly_topic_and_difficulty(template):
+    with pytest.raises(ValueError):
+        build_snapshot(2, {"prompts": {"mcq": template}})
+
+
+@pytest.mark.parametrize("value", [2.7, "2.5", True])
+def test_int_settings_reject_non_integral_values(value):
+    with pytest.raises(ValueError):
+        build_snapshot(2, {"settings": {"max_retries": value}})
+
+
+def test_non_reloadable_setting_is_rejected():
+    with pytest.raises(ValueError):
+        build_snapshot(2, {"settings": {"groq_api_key": "x"}})
+
+
+def test_invalid_file_keeps_previous_version(tmp_path):
+    path = tmp_path / "overrides.json"
+    path.write_text(json.dumps({"settings": {"max_retries": 2}}))
+    registry = ConfigRegistry(str(path), poll_interval=0)
+    good = registry.current()
+    assert good.settings.max_retries == 2
+
+    path.write_text(json.dumps({"prompts": {"mcq": "no vars at all"}}))
+    assert registry.reload(force=True) is good
+
+    path.write_text(json.dumps({"settings": {"max_retries": 1}}))
+    newer = registry.reload(force=True)
+    assert newer.version > good.version
+    assert newer.settings.max_retries == 1
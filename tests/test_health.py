@@ -0,0 +1,73 @@
+import json
+import urllib.error
+import urllib.request
+
+import pytest
+
+from src.common.health import AppStatus, start_health_server
+
+LLM_UP = lambda: (True, {"groq:m": "closed"})  # noqa: E731
+LLM_DOWN = lambda: (False, {"groq:m": "open"})  # noqa: E731
+
+
+def test_ready_when_llm_available_even_without_bank():
+    ready, body = AppStatus().readiness(LLM_UP)
+    assert ready
+    assert body["status"] == "ok"
+
+
+def test_llm_outage_with_bank_stays_ready():
+    ready, body = AppStatus(bank_size=lambda: 12).readiness(LLM_DOWN)
+    assert ready
+    assert body["status"] == "degraded"
+    assert body["question_bank"] == 12
+
+
+def test_llm_outage_without_bank_is_not_ready():
+    ready, body = AppStatus().readiness(LLM_DOWN)
+    assert not ready
+    assert body["status"] == "unavailable"
+
+
+def test_init_error_is_not_ready():
+    ready, body = AppStatus(init_error="question bank: boom", bank_size=lambda: 5).readiness(LLM_UP)
+    assert not ready
+    assert body["reason"] == "question bank: boom"
+
+
+def _get(port: int, path: str) -> tuple[int, str]:
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}") as r:
+            return r.status, r.read().decode()
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode()
+
+
+@pytest.fixture
+def server():
+    servers = []
+
+    def _start(llm_check, status):
+        srv = start_health_server(0, llm_check, status)
+        servers.append(srv)
+        return srv.server_address[1]
+
+    yield _start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+def test_endpoints(server):
+    port = server(LLM_DOWN, AppStatus(bank_size=lambda: 3))
+    assert _get(port, "/livez")[0] == 200
+    status, body = _get(port, "/healthz")
+    assert status == 200 and json.loads(body)["status"] == "degraded"
+    assert _get(port, "/healthz/llm")[0] == 503
+    assert _get(port, "/metrics")[0] == 200
+    assert _get(port, "/nope")[0] == 404
+
+
+def test_port_in_use_returns_none(server):
+    port = server(LLM_UP, AppStatus())
+    assert start_health_server(port, LLM_UP) is None
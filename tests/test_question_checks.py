@@ -0,0 +1,59 @@
+import pytest
+
+from src.models.question_schemas import FillBlankQuestion, MCQQuestion
+from src.validation.question_checks import (
+    QuestionCheck,
+    QuestionRejected,
+    QuestionValidator,
+    _mentions,
+)
+
+
+@pytest.mark.parametrize(
+    ("text", "phrase"),
+    [
+        ("In C++ you use _____ to free memory", "C++"),
+        ("C# properties are declared with _____", "C#"),
+        ("Which runtime does .NET use?", ".NET"),
+        ("Python is a _____ language", "python"),
+    ],
+)
+def test_mentions_matches_whole_terms(text, phrase):
+    assert _mentions(text, phrase)
+
+
+@pytest.mark.parametrize(
+    ("text", "phrase"),
+    [
+        ("Java is not JavaScript", "Script"),
+        ("The C++ standard library", "C"),
+        ("Python is dynamically typed", ""),
+    ],
+)
+def test_mentions_rejects_partial_terms(text, phrase):
+    assert not _mentions(text, phrase)
+
+
+def test_fill_blank_leakage_with_symbol_answer():
+    q = FillBlankQuestion(question="C++ templates are a feature of _____ (C++).", answer="C++")
+    with pytest.raises(QuestionRejected) as exc:
+        QuestionValidator().validate(q)
+    assert exc.value.rejections[0].check == "fill_blank_answer_leakage"
+    assert exc.value.fixable
+
+
+def test_mcq_with_several_options_mentioned_passes():
+    q = MCQQuestion(
+        question="Which is older, C or C++?",
+        options=["C", "C++", "Java", "Go"],
+        correct_answer="C",
+    )
+    assert QuestionValidator().validate(q) is q
+
+
+def test_non_fixable_check_is_reported():
+    check = QuestionCheck("no_go", (MCQQuestion,), lambda q: "banned topic", fixable=False)
+    q = MCQQuestion(question="What is 2 + 2?", options=["1", "2", "3", "4"], correct_answer="4")
+    with pytest.raises(QuestionRejected) as exc:
+        QuestionValidator([check]).validate(q)
+    assert not exc.value.fixable
@@ -0,0 +1,32 @@
+import src.utils.helpers as helpers
+from src.generator.quiz_planner import FILL_BLANK, MCQ, PlannerResult, QuizSpec
+from src.llm.usage import BudgetDecision
+from src.utils.helpers import QuizManager
+
+
+class FakePlanner:
+    def __init__(self, generator):
+        pass
+
+    def generate(self, slots, existing=()):
+        return PlannerResult(
+            questions={
+                s.position: {"type": s.question_type, "question": f"Q{s.position}", "correct_answer": "a"}
+                for s in slots
+            }
+        )
+
+
+def test_budget_reduction_keeps_quiz_mixed(monkeypatch):
+    monkeypatch.setattr(helpers, "QuizPlanner", FakePlanner)
+    monkeypatch.setattr(
+        helpers.usage_tracker, "plan", lambda session, requested: BudgetDecision(requested, 5, "reduced", "test")
+    )
+    spec = QuizSpec.mix(["A", "B", "C"], {MCQ: 6, FILL_BLANK: 4}, "Medium")
+
+    qm = QuizManager(user_id="u")
+    assert qm.generate_quiz(generator=None, spec=spec)
+
+    assert len(qm.questions) == 5
+    assert {q["topic"] for q in qm.questions} == {"A", "B", "C"}
+    assert {q["type"] for q in qm.questions} == {MCQ, FILL_BLANK}
@@ -0,0 +1,29 @@
+from src.llm.usage import OTHER_TOPIC, TokenUsage, UsageTracker
+
+
+def test_sessions_are_bounded_lru():
+    tracker = UsageTracker(max_sessions=2)
+    tracker.record("a", "t", 1, TokenUsage(10, 0))
+    tracker.record("b", "t", 1, TokenUsage(10, 0))
+    tracker.record("a", "t", 1, TokenUsage(10, 0))  # "a" is now most recent
+    tracker.record("c", "t", 1, TokenUsage(10, 0))
+
+    assert tracker.session_usage("a").total_tokens == 20
+    assert tracker.session_usage("b").total_tokens == 0  # evicted
+    assert tracker.session_usage("c").total_tokens == 10
+    # Pod-wide totals are unaffected by eviction.
+    assert tracker.today_usage().total_tokens == 40
+
+
+def test_topics_are_normalized_and_capped():
+    tracker = UsageTracker(max_topics=2)
+    tracker.record("s", "Introduction to Python", 1, TokenUsage(1, 1))
+    tracker.record("s", "python", 1, TokenUsage(1, 1))
+    tracker.record("s", "SQL", 1, TokenUsage(1, 1))
+    tracker.record("s", "Rust", 1, TokenUsage(1, 1))
+    tracker.record("s", "Go", 1, TokenUsage(1, 1))
+
+    usage = tracker.topic_usage()
+    assert set(usage) == {"python", "sql", OTHER_TOPIC}
+    assert usage["python"].total_tokens == 4
+    assert usage[OTHER_TOPIC].total_tokens == 4